@@ -1,15 +1,14 @@
 import os
-from fastapi import FastAPI, HTTPException, Body, Request
+from fastapi import FastAPI, HTTPException, Body, Request, Response
 from fastapi.responses import HTMLResponse, FileResponse
 from pydantic import BaseModel
 from typing import Dict, Any
-from database import Database
+from database import Database, MIN_INKY_INTERVAL, inky_interval_too_short
 
 app = FastAPI(title="Slideshow API")
 db = Database()
 
-@app.get("/", response_class=HTMLResponse)
-def dashboard():
+def _load_dashboard():
     try:
         html_path = os.path.join(os.path.dirname(__file__), "dashboard.html")
         with open(html_path, "r") as f:
@@ -17,31 +16,42 @@ def dashboard():
     except Exception as e:
         return f"<html><body><h1>Error loading dashboard</h1><p>{str(e)}</p></body></html>"
 
+# The dashboard is a static file, read it once instead of on every request
+_DASHBOARD_HTML = _load_dashboard()
+
+@app.get("/", response_class=HTMLResponse)
+def dashboard():
+    return _DASHBOARD_HTML
+
+def _check_etag(request: Request, response: Response):
+    """Tag response with the settings version; return a 304 if the client is up to date."""
+    etag = f'W/"{db.settings_etag}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
 @app.get("/config")
-def get_config():
+def get_config(request: Request, response: Response):
+    not_modified = _check_etag(request, response)
+    if not_modified is not None:
+        return not_modified
     all_settings = db.get_all_settings()
-    # Filter out provider-specific settings for the main dashboard display
-    return {k: v for k, v in all_settings.items() if not k.startswith("provider.")}
+    # Filter out provider-specific and internal settings for the main dashboard display
+    return {k: v for k, v in all_settings.items() if not k.startswith(("provider.", "_"))}
 
 @app.post("/config")
 def update_config(settings: Dict[str, Any] = Body(...)):
     try:
-        # Load current state to validate cross-field constraints
-        current = db.get_all_settings()
-        
-        # Merge incoming changes with current state for validation
-        new_inky = settings.get('enable_inky', current.get('enable_inky', 'False')).lower() == 'true'
-        new_interval_raw = settings.get('default_interval', current.get('default_interval', '5'))
-        new_interval = int(new_interval_raw)
-        
-        if new_inky and new_interval < 30:
+        # Merge incoming changes with the current state to validate cross-field constraints
+        current = db.get_settings(['enable_inky', 'default_interval'])
+        if inky_interval_too_short({**current, **settings}, default_interval='5'):
             raise HTTPException(
                 status_code=400, 
-                detail="Default interval must be at least 30 seconds when Inky is enabled."
+                detail=f"Default interval must be at least {MIN_INKY_INTERVAL} seconds when Inky is enabled."
             )
             
-        for key, value in settings.items():
-            db.set_setting(key, value)
+        db.set_settings(settings)
         return {"status": "ok", "message": "Configuration updated"}
     except HTTPException:
         raise
@@ -60,16 +70,12 @@ def sync_config():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/restart")
-def restart_app():
-    import signal
-    import threading
-    import time
+async def restart_app():
+    import asyncio
     import sys
 
     # Standard restart via re-executing this process
-    def restart_soon():
-        time.sleep(1) # Give time for response to send
-        
+    def restart_now():
         # If we're using a full path to python (like in a venv), use that
         python = sys.executable
         # Get the path to the current script
@@ -80,7 +86,8 @@ def restart_app():
         print("🔄 Restarting application...")
         os.execv(python, [python, script] + args)
 
-    threading.Thread(target=restart_soon).start()
+    # Give time for response to send without tying up a thread
+    asyncio.get_running_loop().call_later(1.0, restart_now)
     return {"status": "ok", "message": "Restarting application..."}
 
 @app.get("/current-image")
@@ -89,8 +96,17 @@ def get_current_image(request: Request):
         slideshow = getattr(request.app.state, 'slideshow', None)
         if slideshow and getattr(slideshow, 'current_photo_path', None):
             path = slideshow.current_photo_path
-            if path and os.path.exists(path):
-                return FileResponse(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                st = None
+            if st is not None:
+                # Hand Starlette our stat result so it doesn't stat the file again
+                headers = None
+                interval = getattr(slideshow, 'interval', None)
+                if isinstance(interval, int) and interval > 0:
+                    headers = {"Cache-Control": f"public, max-age={interval // 1000}"}
+                return FileResponse(path, stat_result=st, headers=headers)
         raise HTTPException(status_code=404, detail="No image currently displayed")
     except HTTPException:
         raise
@@ -100,19 +116,51 @@ def get_current_image(request: Request):
 
 # ==================== Provider Endpoints ====================
 
+# (configured provider, (is_valid, error)) keyed by provider name. The API owns
+# these instances; it never configures the shared ones from providers.get_provider
+_provider_cache = {}
+
+
+def _load_provider_entry(provider_name: str):
+    entry = _provider_cache.get(provider_name)
+    if entry is None:
+        from providers import _get_provider_class
+
+        provider_class = _get_provider_class(provider_name)
+        if provider_class is None:
+            return None
+        provider = provider_class()
+        provider.configure(db.get_provider_settings(provider_name))
+        entry = (provider, provider.validate_config())
+        _provider_cache[provider_name] = entry
+    return entry
+
+
+def _load_provider(provider_name: str):
+    """Return a provider configured from saved settings, or None if unknown."""
+    entry = _load_provider_entry(provider_name)
+    return entry[0] if entry else None
+
+
+def _provider_validation(provider_name: str):
+    """Return the cached (is_valid, error) result for a loaded provider."""
+    return _load_provider_entry(provider_name)[1]
+
+
 @app.get("/providers")
-def list_providers():
+def list_providers(request: Request, response: Response):
     """List all registered image source providers."""
-    from providers import list_providers as get_provider_names, get_provider
+    from providers import list_providers as get_provider_names
+    
+    not_modified = _check_etag(request, response)
+    if not_modified is not None:
+        return not_modified
     
     result = []
     for name in get_provider_names():
-        provider = get_provider(name)
+        provider = _load_provider(name)
         if provider:
-            # Load saved config
-            saved_config = db.get_provider_settings(name)
-            provider.configure(saved_config)
-            is_valid, _ = provider.validate_config()
+            is_valid, _ = _provider_validation(name)
             last_sync = db.get_provider_last_sync(name)
             
             result.append({
@@ -129,16 +177,11 @@ def list_providers():
 @app.get("/providers/{provider_name}")
 def get_provider_info(provider_name: str):
     """Get detailed information about a specific provider."""
-    from providers import get_provider
-    
-    provider = get_provider(provider_name)
+    provider = _load_provider(provider_name)
     if not provider:
         raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
     
-    # Load saved config
-    saved_config = db.get_provider_settings(provider_name)
-    provider.configure(saved_config)
-    is_valid, error = provider.validate_config()
+    is_valid, error = _provider_validation(provider_name)
     last_sync = db.get_provider_last_sync(provider_name)
     
     return {
@@ -156,15 +199,10 @@ def get_provider_info(provider_name: str):
 @app.get("/providers/{provider_name}/config")
 def get_provider_config(provider_name: str):
     """Get configuration schema and current values for a provider."""
-    from providers import get_provider
-    
-    provider = get_provider(provider_name)
+    provider = _load_provider(provider_name)
     if not provider:
         raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
     
-    saved_config = db.get_provider_settings(provider_name)
-    provider.configure(saved_config)
-    
     return {
         "schema": provider.get_config_schema(),
         "values": provider.get_config(),
@@ -174,10 +212,10 @@ def get_provider_config(provider_name: str):
 @app.post("/providers/{provider_name}/config")
 def update_provider_config(provider_name: str, settings: Dict[str, Any] = Body(...)):
     """Update configuration for a provider."""
-    from providers import get_provider
+    from providers import _get_provider_class
     
-    provider = get_provider(provider_name)
-    if not provider:
+    provider_class = _get_provider_class(provider_name)
+    if provider_class is None:
         raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
     
     try:
@@ -185,17 +223,21 @@ def update_provider_config(provider_name: str, settings: Dict[str, Any] = Body(.
         existing = db.get_provider_settings(provider_name)
         merged = {**existing, **settings}
         
-        # Validate new config
-        provider.configure(merged)
-        is_valid, error = provider.validate_config()
+        # Configure a new instance rather than the cached one, which a refresh
+        # or force-sync may be using on another worker thread
+        candidate = provider_class()
+        candidate.configure(merged)
+        is_valid, error = candidate.validate_config()
         
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"Invalid configuration: {error}")
         
         # Save to database
         db.set_provider_settings(provider_name, merged)
+        # Swap in the new instance; requests already holding the old one finish with it
+        _provider_cache[provider_name] = (candidate, (is_valid, error))
         
-        return {"status": "ok", "message": f"Configuration updated for {provider.display_name}"}
+        return {"status": "ok", "message": f"Configuration updated for {provider_class.display_name}"}
     except HTTPException:
         raise
     except Exception as e:
@@ -205,17 +247,11 @@ def update_provider_config(provider_name: str, settings: Dict[str, Any] = Body(.
 @app.post("/providers/{provider_name}/test")
 def test_provider_connection(provider_name: str):
     """Test the connection to a provider's external service."""
-    from providers import get_provider
-    
-    provider = get_provider(provider_name)
+    provider = _load_provider(provider_name)
     if not provider:
         raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
     
     try:
-        # Load saved config
-        saved_config = db.get_provider_settings(provider_name)
-        provider.configure(saved_config)
-        
         success, message = provider.test_connection()
         
         return {
@@ -230,19 +266,13 @@ def test_provider_connection(provider_name: str):
 @app.post("/providers/{provider_name}/refresh")
 def refresh_provider(provider_name: str):
     """Trigger image refresh/download from a provider."""
-    from providers import get_provider
-    
-    provider = get_provider(provider_name)
+    provider = _load_provider(provider_name)
     if not provider:
         raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
     
     try:
-        # Load saved config
-        saved_config = db.get_provider_settings(provider_name)
-        provider.configure(saved_config)
-        
         # Validate before refresh
-        is_valid, error = provider.validate_config()
+        is_valid, error = _provider_validation(provider_name)
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"Provider not configured: {error}")
         
@@ -269,20 +299,13 @@ def refresh_provider(provider_name: str):
 @app.post("/providers/{provider_name}/force-sync")
 def force_sync_provider(provider_name: str):
     """Clear target folder and perform a full refresh from the provider."""
-    from providers import get_provider
-    import shutil
-    
-    provider = get_provider(provider_name)
+    provider = _load_provider(provider_name)
     if not provider:
         raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
     
     try:
-        # Load saved config
-        saved_config = db.get_provider_settings(provider_name)
-        provider.configure(saved_config)
-        
         # Validate before sync
-        is_valid, error = provider.validate_config()
+        is_valid, error = _provider_validation(provider_name)
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"Provider not configured: {error}")
             
@@ -293,15 +316,14 @@ def force_sync_provider(provider_name: str):
         # Safety check: only clear if directory exists and is not root or critical dir
         if os.path.exists(target_folder) and len(target_folder) > 5:
             # List of extensions to remove
-            ext_str = db.get_setting('image_extensions', '.jpg,.jpeg,.png,.gif,.bmp,.webp')
-            valid_exts = {e.strip().lower() for e in ext_str.split(',')}
+            valid_exts = tuple(sorted(db.image_extensions))
             
-            for item in os.listdir(target_folder):
-                item_path = os.path.join(target_folder, item)
-                if os.path.isfile(item_path):
-                    _, ext = os.path.splitext(item.lower())
-                    if ext in valid_exts or not valid_exts:
-                        os.remove(item_path)
+            # scandir gives us the file type without an extra stat per entry
+            with os.scandir(target_folder) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        if not valid_exts or entry.name.lower().endswith(valid_exts):
+                            os.unlink(entry.path)
         
         # Execute refresh (now it will download everything since folder is empty)
         result = provider.refresh(target_folder)
@@ -320,9 +342,7 @@ def force_sync_provider(provider_name: str):
 @app.get("/providers/{provider_name}/status")
 def get_provider_status(provider_name: str):
     """Get the last sync status for a provider."""
-    from providers import get_provider
-    
-    provider = get_provider(provider_name)
+    provider = _load_provider(provider_name)
     if not provider:
         raise HTTPException(status_code=404, detail=f"Provider '{provider_name}' not found")
     
@@ -1,56 +1,222 @@
 import sqlite3
 import os
+import atexit
 import threading
+import uuid
 import configparser
+import json
 import sys
+from datetime import datetime
+
+SCHEMA_VERSION = 1
+
+DEFAULT_IMAGE_EXTENSIONS = '.jpg,.jpeg,.png,.gif,.bmp,.webp'
+
+# Internal settings are prefixed with "_" and hidden from the dashboard
+CONFIG_SIG_KEY = '_config_sig'
+
+# Inky e-paper panels take a long time to refresh, so slower intervals are enforced
+MIN_INKY_INTERVAL = 30
+
+def parse_extensions(ext_str):
+    """Turn a comma separated extension list into a frozenset of lowercase extensions."""
+    return frozenset(e.strip().lower() for e in ext_str.split(',') if e.strip())
+
+def inky_interval_too_short(settings, default_interval='30'):
+    """Return True if settings enable Inky with an interval below MIN_INKY_INTERVAL."""
+    is_inky = str(settings.get('enable_inky', 'False')).lower() == 'true'
+    interval = int(settings.get('default_interval', default_interval))
+    return is_inky and interval < MIN_INKY_INTERVAL
 
 class Database:
     def __init__(self, db_path="/etc/slideshow/config.db", config_locations=None):
         self.db_path = db_path
-        self._lock = threading.Lock()
+        self._config_path = None  # config.ini matched by the last sync
+        self._config_cache = None  # ((path, mtime_ns, size), parsed [slideshow] section)
+        # Reentrant so a DB helper can safely call another one while holding it
+        self._lock = threading.RLock()
         self.config_locations = config_locations
+        self._cache = None  # Lazily populated copy of the settings table
+        self._version = 0  # Bumped on every write, used for HTTP ETags
+        # Distinguishes this instance's versions from those of an earlier process,
+        # whose counter also started at 0 (e.g. before a /restart)
+        self._instance_token = uuid.uuid4().hex[:8]
+        self._last_sync_cache = {}  # provider name -> (raw JSON, parsed dict)
+        self._extensions_cache = (None, frozenset())  # (raw setting, parsed extensions)
+        self._data_version = None  # Last PRAGMA data_version seen by refresh_if_changed
+        self._cache_data_version = None  # PRAGMA data_version the settings cache was read at
         self._init_db()
         self.load_defaults()
-        self.sync_with_config()
+        self.sync_with_config(force=False)
         self._validate_inky_constraint()
 
+    @property
+    def config_locations(self):
+        return self._config_locations
+
+    @config_locations.setter
+    def config_locations(self, locations):
+        # New search locations invalidate the remembered config.ini
+        self._config_locations = locations
+        self._config_path = None
+
     def _init_db(self):
         # Ensure directory exists if possible, though strict permissions might block this
         # Usually setup.sh handles creation, but good to be safe for dev
-        try:
-             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        except OSError:
-             pass # Likely permission denied, assume dir exists
-
-        with self._lock, sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                )
-            """)
-            conn.commit()
+        # db_path may also be an SQLite URI ("file:name?mode=memory&cache=shared"),
+        # which has no directory to create
+        is_uri = self.db_path.startswith('file:')
+        if not is_uri:
+            try:
+                 os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            except OSError:
+                 pass # Likely permission denied, assume dir exists
+
+        # One long-lived connection shared by all threads (guarded by self._lock).
+        # isolation_level=None puts sqlite3 in autocommit mode.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, uri=is_uri)
+        atexit.register(self.close)
+        with self._lock:
+            # WAL needs a real file; in-memory databases keep their default journal
+            if self.db_path != ':memory:' and 'mode=memory' not in self.db_path:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # main.py and api.py each hold a connection; wait on SQLITE_BUSY instead of failing
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            # Per-connection tuning, only effective because the connection is long-lived
+            self._conn.execute("PRAGMA cache_size=-8192")  # 8 MiB
+            self._conn.execute("PRAGMA mmap_size=134217728")  # 128 MiB
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            # user_version marks an initialised schema so hot starts skip the DDL
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS settings (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            self._cache_data_version = self._data_version
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _check_other_writes(self):
+        """Drop the cache if another connection committed since it was read. Caller must hold self._lock.
+
+        main.py and api.py each own a Database, so without this one would keep
+        serving settings the other has already changed.
+        """
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._cache_data_version:
+            self._cache_data_version = data_version
+            self._cache = None
+            self._version += 1
+
+    def _load_cache(self):
+        """Populate the in-memory settings cache. Caller must hold self._lock."""
+        self._check_other_writes()
+        if self._cache is None:
+            # (key, value) rows feed dict() directly, no intermediate list
+            self._cache = dict(self._conn.execute("SELECT key, value FROM settings"))
+        return self._cache
+
+    def invalidate_cache(self):
+        """Drop cached settings so the next read goes back to the database."""
+        with self._lock:
+            self._cache = None
+            self._version += 1
+
+    def refresh_if_changed(self):
+        """Drop the settings cache if another connection wrote to the database.
+
+        PRAGMA data_version only changes on commits from other connections, so
+        this is a single cheap query when nothing happened. Returns True if the
+        cache was invalidated.
+        """
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return False
+            self._data_version = data_version
+            self._cache = None
+            self._version += 1
+            return True
+
+    @property
+    def settings_version(self):
+        """Counter that changes whenever any setting may have changed."""
+        with self._lock:
+            self._check_other_writes()
+            return self._version
+
+    @property
+    def settings_etag(self):
+        """settings_version qualified by a per-instance token, for use as an HTTP ETag."""
+        return f"{self._instance_token}-v{self.settings_version}"
+
+    @property
+    def image_extensions(self):
+        """The image_extensions setting as a frozenset, re-parsed only when it changes."""
+        raw = self.get_setting('image_extensions', DEFAULT_IMAGE_EXTENSIONS)
+        cached_raw, extensions = self._extensions_cache
+        if raw != cached_raw:
+            extensions = parse_extensions(raw)
+            self._extensions_cache = (raw, extensions)
+        return extensions
 
     def get_setting(self, key, default=None):
-        with self._lock, sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT value FROM settings WHERE key = ?", (key,))
-            row = cursor.fetchone()
-            return row[0] if row else default
+        with self._lock:
+            return self._load_cache().get(key, default)
 
     def set_setting(self, key, value):
-        with self._lock, sqlite3.connect(self.db_path) as conn:
-            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (str(key), str(value)))
-            conn.commit()
+        # Settings are stored as TEXT; skip the conversion for the common str case
+        key = key if type(key) is str else str(key)
+        value = value if type(value) is str else str(value)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+            if self._cache is not None:
+                self._cache[key] = value
+            self._version += 1
+
+    def get_settings(self, keys):
+        """Get a subset of settings; keys that are not set are omitted."""
+        with self._lock:
+            cache = self._load_cache()
+            return {key: cache[key] for key in keys if key in cache}
+
+    def set_settings(self, items):
+        """Write several settings in a single transaction."""
+        rows = [
+            (k if type(k) is str else str(k), v if type(v) is str else str(v))
+            for k, v in items.items()
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if self._cache is not None:
+                self._cache.update(rows)
+            self._version += 1
 
     def get_all_settings(self):
-        with self._lock, sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT key, value FROM settings")
-            return {row[0]: row[1] for row in cursor.fetchall()}
+        with self._lock:
+            return dict(self._load_cache())
 
     def is_empty(self):
-        with self._lock, sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM settings")
-            return cursor.fetchone()[0] == 0
+        with self._lock:
+            cursor = self._conn.execute("SELECT 1 FROM settings LIMIT 1")
+            return cursor.fetchone() is None
 
     def load_defaults(self):
         """Load built-in defaults if no config.ini or DB exists."""
@@ -60,31 +226,38 @@ class Database:
             'background_color': 'black',
             'enable_manual_controls': 'True',
             'start_fullscreen': 'True',
-            'image_extensions': '.jpg,.jpeg,.png,.gif,.bmp,.webp',
+            'image_extensions': DEFAULT_IMAGE_EXTENSIONS,
             'enable_inky': 'False',
             'orientation': 'landscape'
         }
-        for k, v in defaults.items():
-            if self.get_setting(k) is None:
-                self.set_setting(k, v)
+        with self._lock:
+            existing = self._load_cache().keys()
+            missing = {k: v for k, v in defaults.items() if k not in existing}
+        self.set_settings(missing)
 
-    def sync_with_config(self):
-        """Searches for config.ini and loads settings into DB if found."""
-        config = configparser.ConfigParser()
-        
+    @staticmethod
+    def _default_config_locations():
+        """Yield config.ini candidates lazily so later paths are only built if needed."""
         # Locations: prioritizing system config then CWD then user config then script directory
-        locations = self.config_locations or [
-            '/etc/slideshow/config.ini',
-            os.path.join(os.getcwd(), 'config.ini'),
-            os.path.expanduser('~/.config/simple-image-slideshow/config.ini'),
-            os.path.join(os.path.dirname(__file__), 'config.ini')
-        ]
+        yield '/etc/slideshow/config.ini'
+        yield os.path.join(os.getcwd(), 'config.ini')
+        yield os.path.expanduser('~/.config/simple-image-slideshow/config.ini')
+        yield os.path.join(os.path.dirname(__file__), 'config.ini')
+
+    def sync_with_config(self, force=True):
+        """Searches for config.ini and loads settings into DB if found.
+
+        With force=False the file is skipped when it is unchanged since the
+        last sync (same mtime and size), which keeps warm starts write-free.
+        """
+        self.invalidate_cache()
         
-        config_file = None
-        for loc in locations:
-            if os.path.exists(loc):
-                config_file = loc
-                break
+        # Reuse the previously matched file while it still exists
+        config_file = self._config_path
+        if not (config_file and os.path.exists(config_file)):
+            locations = self.config_locations or self._default_config_locations()
+            config_file = next((loc for loc in locations if os.path.exists(loc)), None)
+            self._config_path = config_file
                 
         if not config_file:
             print("⚠️ Warning: config.ini not found! Using database or basic defaults.", file=sys.stderr)
@@ -93,20 +266,20 @@ class Database:
             return False
             
         print(f"📖 MATCHED CONFIG: {config_file}", file=sys.stderr)
-        config.read(config_file)
+        st = os.stat(config_file)
+        sig = f"{config_file}:{st.st_mtime_ns}:{st.st_size}"
+        if not force and self.get_setting(CONFIG_SIG_KEY) == sig:
+            return True
+        section = self._read_config_section(config_file, st)
         
-        if 'slideshow' in config:
+        if section is not None:
             # Pre-validate inky constraint from the file
-            inky_enabled = config['slideshow'].get('enable_inky', 'False').lower() == 'true'
-            interval = int(config['slideshow'].get('default_interval', '30'))
-            
             # Note: We don't raise error here but adjust to be safe
-            if inky_enabled and interval < 30:
-                print("⚠️ Warning: Inky enabled with < 30s interval in config.ini. Adjusting to 30s.", file=sys.stderr)
-                config['slideshow']['default_interval'] = '30'
+            if inky_interval_too_short(section):
+                print(f"⚠️ Warning: Inky enabled with < {MIN_INKY_INTERVAL}s interval in config.ini. Adjusting to {MIN_INKY_INTERVAL}s.", file=sys.stderr)
+                section = {**section, 'default_interval': str(MIN_INKY_INTERVAL)}
 
-            for key, value in config['slideshow'].items():
-                self.set_setting(key, value)
+            self.set_settings({**section, CONFIG_SIG_KEY: sig})
             return True
         
         print("⚠️ Warning: [slideshow] section not found in config.ini!", file=sys.stderr)
@@ -114,15 +287,28 @@ class Database:
             self.load_defaults()
         return False
 
+    def _read_config_section(self, config_file, st):
+        """Return the [slideshow] section of config_file as a dict, or None if missing.
+
+        The parsed section is cached and only re-read when the file changes on disk.
+        """
+        key = (config_file, st.st_mtime_ns, st.st_size)
+        if self._config_cache is not None and self._config_cache[0] == key:
+            return self._config_cache[1]
+
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(config_file)
+        section = dict(config['slideshow']) if 'slideshow' in config else None
+        self._config_cache = (key, section)
+        return section
+
     def _validate_inky_constraint(self):
         """Ensures default_interval is at least 30 if inky is enabled."""
-        all_settings = self.get_all_settings()
-        is_inky = all_settings.get('enable_inky', 'False').lower() == 'true'
-        interval = int(all_settings.get('default_interval', '30'))
+        current = self.get_settings(['enable_inky', 'default_interval'])
 
-        if is_inky and interval < 30:
-            print(f"⚠️ Boot-time Fix: Inky enabled with {interval}s interval. Correcting to 30s.", file=sys.stderr)
-            self.set_setting('default_interval', '30')
+        if inky_interval_too_short(current):
+            print(f"⚠️ Boot-time Fix: Inky enabled with {current['default_interval']}s interval. Correcting to {MIN_INKY_INTERVAL}s.", file=sys.stderr)
+            self.set_setting('default_interval', str(MIN_INKY_INTERVAL))
 
     # ==================== Provider Settings ====================
     
@@ -137,12 +323,14 @@ class Database:
             Dictionary of provider-specific settings (without the prefix)
         """
         prefix = f"provider.{provider_name}."
-        all_settings = self.get_all_settings()
-        return {
-            key[len(prefix):]: value 
-            for key, value in all_settings.items() 
-            if key.startswith(prefix)
-        }
+        start = len(prefix)
+        # Filter the cached settings directly instead of copying the whole table first
+        with self._lock:
+            return {
+                key[start:]: value 
+                for key, value in self._load_cache().items() 
+                if key.startswith(prefix)
+            }
     
     def set_provider_setting(self, provider_name: str, key: str, value) -> None:
         """
@@ -164,8 +352,10 @@ class Database:
             provider_name: The unique provider identifier
             settings: Dictionary of key-value pairs to set
         """
-        for key, value in settings.items():
-            self.set_provider_setting(provider_name, key, value)
+        self.set_settings({
+            f"provider.{provider_name}.{key}": value
+            for key, value in settings.items()
+        })
     
     def get_provider_last_sync(self, provider_name: str) -> dict:
         """
@@ -177,13 +367,17 @@ class Database:
         Returns:
             Dictionary with last sync info or empty dict if never synced
         """
-        import json
         result_json = self.get_setting(f"provider.{provider_name}._last_sync")
         if result_json:
-            try:
-                return json.loads(result_json)
-            except json.JSONDecodeError:
-                return {}
+            # Only re-parse when the stored JSON has changed
+            cached = self._last_sync_cache.get(provider_name)
+            if cached is None or cached[0] != result_json:
+                try:
+                    cached = (result_json, json.loads(result_json))
+                except json.JSONDecodeError:
+                    return {}
+                self._last_sync_cache[provider_name] = cached
+            return dict(cached[1])
         return {}
     
     def set_provider_last_sync(self, provider_name: str, result: dict) -> None:
@@ -194,7 +388,5 @@ class Database:
             provider_name: The unique provider identifier
             result: Dictionary with sync result data
         """
-        import json
-        from datetime import datetime
         result["timestamp"] = datetime.utcnow().isoformat() + "Z"
         self.set_setting(f"provider.{provider_name}._last_sync", json.dumps(result))
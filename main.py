@@ -2,17 +2,36 @@ import os
 import sys
 import tkinter as tk
 import argparse
-import configparser
 import threading
-import uvicorn
 from slideshow import SlideshowApp
 from database import Database
-from api import app as api_app
 
-# load_config removed, now handled by Database class
+# The API (FastAPI/uvicorn) is imported on its own thread so it doesn't delay
+# the first Tk paint; whichever side finishes last links the slideshow to it.
+_api_lock = threading.Lock()
+_api_app = None
+_slideshow = None
+
+def _attach_slideshow():
+    # Caller must hold _api_lock
+    if _api_app is not None and _slideshow is not None:
+        _api_app.state.slideshow = _slideshow
+
+def expose_slideshow(app):
+    """Make the slideshow available to the API (e.g. for the current image preview)."""
+    global _slideshow
+    with _api_lock:
+        _slideshow = app
+        _attach_slideshow()
 
 def start_api_server():
+    global _api_app
     try:
+        import uvicorn
+        from api import app as api_app
+        with _api_lock:
+            _api_app = api_app
+            _attach_slideshow()
         # Run uvicorn programmatically
         uvicorn.run(api_app, host="0.0.0.0", port=8080, log_level="info")
     except Exception as e:
@@ -66,7 +85,7 @@ def main():
     )
     
     # Expose app instance to API for features like current image preview
-    api_app.state.slideshow = app
+    expose_slideshow(app)
     
     root.mainloop()
 
@@ -5,12 +5,21 @@ This module provides a plugin-based architecture for integrating
 external image sources with the slideshow application.
 """
 
+import importlib
 from typing import Dict, Type, List, Optional, Any
 from .base import BaseImageProvider
 
 # Provider registry
 _PROVIDERS: Dict[str, Type[BaseImageProvider]] = {}
 
+# Built-in providers, imported and registered on first use: name -> "module:Class"
+_LAZY_PROVIDERS: Dict[str, str] = {
+    "immich": ".immich:ImmichProvider",
+}
+
+# Shared provider instances, created on first use
+_PROVIDER_INSTANCES: Dict[str, BaseImageProvider] = {}
+
 
 def register_provider(provider_class: Type[BaseImageProvider]) -> Type[BaseImageProvider]:
     """
@@ -24,22 +33,34 @@ def register_provider(provider_class: Type[BaseImageProvider]) -> Type[BaseImage
         The same provider class (for decorator usage)
     """
     _PROVIDERS[provider_class.name] = provider_class
+    _PROVIDER_INSTANCES.pop(provider_class.name, None)
     return provider_class
 
 
+def _get_provider_class(name: str) -> Optional[Type[BaseImageProvider]]:
+    """Look up a provider class, importing a lazily registered one if needed."""
+    if name not in _PROVIDERS and name in _LAZY_PROVIDERS:
+        module_name, class_name = _LAZY_PROVIDERS[name].split(":")
+        register_provider(getattr(importlib.import_module(module_name, __name__), class_name))
+    return _PROVIDERS.get(name)
+
+
 def get_provider(name: str) -> Optional[BaseImageProvider]:
     """
-    Get an instance of a registered provider by name.
+    Get the shared instance of a registered provider by name.
     
     Args:
         name: The unique provider identifier
         
     Returns:
-        A new instance of the provider, or None if not found
+        The provider instance (created on first use), or None if not found
     """
-    if name in _PROVIDERS:
-        return _PROVIDERS[name]()
-    return None
+    provider = _PROVIDER_INSTANCES.get(name)
+    if provider is None:
+        cls = _get_provider_class(name)
+        if cls is not None:
+            provider = _PROVIDER_INSTANCES.setdefault(name, cls())
+    return provider
 
 
 def list_providers() -> List[str]:
@@ -49,17 +70,17 @@ def list_providers() -> List[str]:
     Returns:
         List of provider identifiers
     """
-    return list(_PROVIDERS.keys())
+    return list(dict.fromkeys([*_LAZY_PROVIDERS, *_PROVIDERS]))
 
 
 def get_all_providers() -> Dict[str, BaseImageProvider]:
     """
-    Get instances of all registered providers.
+    Get the shared instances of all registered providers.
     
     Returns:
         Dictionary mapping provider names to instances
     """
-    return {name: cls() for name, cls in _PROVIDERS.items()}
+    return {name: get_provider(name) for name in list_providers()}
 
 
 def get_provider_info(name: str) -> Optional[Dict[str, Any]]:
@@ -72,8 +93,8 @@ def get_provider_info(name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with provider metadata, or None if not found
     """
-    if name in _PROVIDERS:
-        cls = _PROVIDERS[name]
+    cls = _get_provider_class(name)
+    if cls is not None:
         return {
             "name": cls.name,
             "display_name": cls.display_name,
@@ -81,7 +102,3 @@ def get_provider_info(name: str) -> Optional[Dict[str, Any]]:
         }
     return None
 
-
-# Auto-register built-in providers
-from .immich import ImmichProvider
-register_provider(ImmichProvider)
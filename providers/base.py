@@ -6,7 +6,7 @@ Defines the abstract base class that all image source providers must implement.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -27,11 +27,7 @@ class RefreshResult:
     skipped: int = 0
     failed: int = 0
     total: int = 0
-    errors: List[str] = None
-    
-    def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
+    errors: List[str] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -46,9 +42,9 @@ class RefreshResult:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConfigField:
-    """Definition of a configuration field for a provider."""
+    """Definition of a configuration field for a provider (immutable, so providers can share them)."""
     key: str
     label: str
     field_type: str  # "text", "password", "select", "number", "boolean"
@@ -146,6 +142,11 @@ class BaseImageProvider(ABC):
         """
         pass
     
+    def reset(self) -> None:
+        """Return the provider to its unconfigured state."""
+        self._config = {}
+        self._last_result = None
+    
     def get_config(self) -> Dict[str, Any]:
         """Get the current configuration (excluding sensitive fields)."""
         # Subclasses can override to hide passwords
@@ -156,5 +157,15 @@ class BaseImageProvider(ABC):
         return self._last_result
     
     def get_config_schema(self) -> List[Dict[str, Any]]:
-        """Get the configuration schema as a list of dictionaries."""
-        return [field.to_dict() for field in self.get_config_fields()]
+        """
+        Get the configuration schema as a list of dictionaries.
+        
+        Config fields are static per provider class, so the schema is built
+        once and shared by all instances. Callers must not mutate it.
+        """
+        cls = type(self)
+        schema = cls.__dict__.get("_config_schema")
+        if schema is None:
+            schema = [config_field.to_dict() for config_field in self.get_config_fields()]
+            cls._config_schema = schema
+        return schema
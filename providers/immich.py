@@ -6,6 +6,7 @@ for the slideshow application.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List, Optional, Tuple
 
 from .base import BaseImageProvider, ConfigField, RefreshResult, RefreshStatus
@@ -23,44 +24,51 @@ class ImmichProvider(BaseImageProvider):
     display_name = "Immich"
     description = "Download images from your Immich photo management server"
     
+    # Concurrent downloads per refresh
+    max_download_workers = 8
+    
+    # Config fields are static, so they are built once for the class
+    _CONFIG_FIELDS = (
+        ConfigField(
+            key="server_url",
+            label="Server URL",
+            field_type="text",
+            required=True,
+            description="Full URL to your Immich server (e.g., https://photos.example.com)",
+        ),
+        ConfigField(
+            key="api_key",
+            label="API Key",
+            field_type="password",
+            required=True,
+            description="Your Immich API key (generate in Immich Account Settings)",
+        ),
+        ConfigField(
+            key="album_name",
+            label="Album Name",
+            field_type="text",
+            required=False,
+            default="",
+            description="Specific album to download (leave empty for all assets)",
+        ),
+        ConfigField(
+            key="skip_existing",
+            label="Skip Existing Files",
+            field_type="boolean",
+            required=False,
+            default=True,
+            description="Skip downloading files that already exist locally",
+        ),
+    )
+    
     def __init__(self):
         super().__init__()
         self._client = None
+        self._album_id = None  # Resolved id of the configured album
     
     def get_config_fields(self) -> List[ConfigField]:
         """Return configuration fields for Immich provider."""
-        return [
-            ConfigField(
-                key="server_url",
-                label="Server URL",
-                field_type="text",
-                required=True,
-                description="Full URL to your Immich server (e.g., https://photos.example.com)",
-            ),
-            ConfigField(
-                key="api_key",
-                label="API Key",
-                field_type="password",
-                required=True,
-                description="Your Immich API key (generate in Immich Account Settings)",
-            ),
-            ConfigField(
-                key="album_name",
-                label="Album Name",
-                field_type="text",
-                required=False,
-                default="",
-                description="Specific album to download (leave empty for all assets)",
-            ),
-            ConfigField(
-                key="skip_existing",
-                label="Skip Existing Files",
-                field_type="boolean",
-                required=False,
-                default=True,
-                description="Skip downloading files that already exist locally",
-            ),
-        ]
+        return list(self._CONFIG_FIELDS)
     
     def configure(self, settings: Dict[str, Any]) -> None:
         """Apply configuration settings."""
@@ -70,8 +78,15 @@ class ImmichProvider(BaseImageProvider):
             "album_name": settings.get("album_name", ""),
             "skip_existing": str(settings.get("skip_existing", "True")).lower() == "true",
         }
-        # Reset client when config changes
+        # Reset client and resolved album when config changes
+        self._client = None
+        self._album_id = None
+    
+    def reset(self) -> None:
+        """Forget configuration, client and cached album."""
+        super().reset()
         self._client = None
+        self._album_id = None
     
     def validate_config(self) -> Tuple[bool, Optional[str]]:
         """Validate the current configuration."""
@@ -173,22 +188,40 @@ class ImmichProvider(BaseImageProvider):
         errors = []
         skip_existing = self._config.get("skip_existing", True)
         
+        # Decide what to fetch up front, then download in parallel (I/O bound)
+        # One directory read instead of an exists() call per asset
+        existing = set()
+        if skip_existing:
+            with os.scandir(target_folder) as entries:
+                existing = {entry.name for entry in entries}
+        
+        pending = []
+        queued = set()
         for asset in assets:
             asset_id = asset.get("id")
             filename = asset.get("originalFileName", f"{asset_id}.jpg")
-            output_path = os.path.join(target_folder, filename)
             
-            # Skip if file exists and skip_existing is enabled
-            if skip_existing and os.path.exists(output_path):
+            # Skip if file exists and skip_existing is enabled. Assets sharing a file
+            # name (e.g. IMG_0001.JPG from two phones) are always queued only once,
+            # since parallel downloads to the same path would clobber each other.
+            if filename in existing or filename in queued:
                 skipped += 1
                 continue
-            
-            try:
-                client.download_asset(asset_id, output_path)
-                downloaded += 1
-            except Exception as e:
-                failed += 1
-                errors.append(f"Failed to download {filename}: {str(e)}")
+            queued.add(filename)
+            pending.append((asset_id, filename, os.path.join(target_folder, filename)))
+        
+        with ThreadPoolExecutor(max_workers=self.max_download_workers) as pool:
+            futures = {
+                pool.submit(self._download_asset, client, asset_id, output_path): filename
+                for asset_id, filename, output_path in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    downloaded += 1
+                except Exception as e:
+                    failed += 1
+                    errors.append(f"Failed to download {futures[future]}: {str(e)}")
         
         # Determine overall status
         total = len(assets)
@@ -214,20 +247,47 @@ class ImmichProvider(BaseImageProvider):
         self._last_result = result
         return result
     
+    def _download_asset(self, client, asset_id: str, output_path: str) -> None:
+        """Download one asset via a .part file so an interrupted download never looks complete."""
+        part_path = output_path + ".part"
+        try:
+            # immich-lib streams to disk and returns False (instead of raising) on failure
+            if client.download_asset(asset_id, part_path) is False:
+                raise IOError("download failed")
+            os.replace(part_path, output_path)
+        except BaseException:
+            try:
+                os.unlink(part_path)
+            except OSError:
+                pass
+            raise
+    
     def _get_assets(self, client) -> List[Dict[str, Any]]:
         """Fetch assets from Immich, optionally filtered by album."""
         album_name = self._config.get("album_name", "").strip()
         
         if album_name:
-            # Find album by name
-            album = client.find_album(album_name)
-            if not album:
-                raise ValueError(f"Album '{album_name}' not found")
-            
-            # Get album details with assets
-            album_detail = client.get_album(album["id"])
+            # Reuse the album id from a previous refresh to skip listing all albums
+            album_detail = None
+            if self._album_id:
+                try:
+                    album_detail = client.get_album(self._album_id)
+                except Exception:
+                    # immich-lib raises for a deleted album; look it up by name again
+                    pass
+                if not album_detail:
+                    self._album_id = None
             if not album_detail:
-                raise ValueError(f"Could not retrieve album details")
+                # Find album by name
+                album = client.find_album(album_name)
+                if not album:
+                    raise ValueError(f"Album '{album_name}' not found")
+                
+                # Get album details with assets
+                album_detail = client.get_album(album["id"])
+                if not album_detail:
+                    raise ValueError(f"Could not retrieve album details")
+                self._album_id = album["id"]
             
             return album_detail.get("assets", [])
         else:
@@ -1,22 +1,61 @@
 import os
+import math
 import random
 import tkinter as tk
 import threading
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk, ImageOps
 from inky.auto import auto
+from database import DEFAULT_IMAGE_EXTENSIONS, parse_extensions
+
+# EXIF Orientation tag value -> transpose that displays the image upright
+EXIF_ORIENTATION = 0x0112
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
 
 class SlideshowApp:
+    # Number of rendered frames kept for revisits (each is a window-sized bitmap)
+    photo_cache_size = 10
+
     def __init__(self, root, image_folder, interval=5, fullscreen=True, db=None):
         self.root = root
         self.image_folder = image_folder
         self.interval = interval * 1000  # Convert to milliseconds
-        self.images = []
-        self.current_image_index = 0
+        self.images = []  # Sorted scan of the folder
+        self._order = []  # Play order: a permutation of indices into self.images
+        self.current_image_index = 0  # Position in self._order
         self.db = db
         self._timer_id = None
         self._reload_timer_id = None
         self.is_first_run = True
         self.current_photo_path = None
+        # ((path, mtime_ns, win_w, win_h, orientation), inky_resolution) ->
+        # (PhotoImage, resized PIL image for Inky), LRU ordered. The mtime makes a
+        # file replaced under the same name render again.
+        self._photo_cache = OrderedDict()
+        self._last_render = None  # What update_display last put on screen
+        self._scanned = None  # _scan_signature() at the last load_images
+        self._ext_suffixes = (None, ())  # (ext_str, parsed suffix tuple for endswith)
+        self._screen_w = self._screen_h = None  # Filled in by _screen_size()
+        self._orient_cache = {}  # path -> (mtime_ns, EXIF orientation)
+        # The next photo is decoded on a single background thread while the current one shows
+        self._prefetch_executor = None
+        self._prefetch = None  # ((key, inky_resolution), Future) of the pending prefetch
+        self._fullscreen = False  # Mirrors the window's -fullscreen attribute
+        # Inky frames are rendered by a background worker; only the newest is kept
+        self._inky_queue = queue.Queue(maxsize=1)
+        self._inky_thread = None
+        self._inky = None
+        self._inky_resolution = None
 
         # Initial Configuration Load
         self.reload_config()
@@ -28,7 +67,8 @@ class SlideshowApp:
         self.root.configure(bg=self.bg_color)
         
         # UI Setup & Basic Bindings
-        self.root.attributes("-fullscreen", fullscreen)
+        self._fullscreen = bool(fullscreen)
+        self.root.attributes("-fullscreen", self._fullscreen)
         self.update_cursor() # Initial cursor state
 
         self.label = tk.Label(root, bg=self.bg_color)
@@ -53,7 +93,17 @@ class SlideshowApp:
         self._reload_timer_id = self.root.after(5000, self.auto_reload)
         
     def auto_reload(self):
-        self.reload_config()
+        # Only re-read settings when another connection (the API) wrote to the DB;
+        # otherwise the tick just checks whether the image folder changed
+        refresh = getattr(self.db, 'refresh_if_changed', None)
+        if refresh is None or refresh():
+            self.reload_config()
+        else:
+            if self._scan_signature() != self._scanned:
+                self.load_images()
+            # A failed Inky update only disables the panel until the next tick
+            if not self.ink_screen:
+                self.ink_screen = self.db.get_setting('enable_inky', 'False').lower() == 'true'
         self.schedule_reload()
 
     def reload_config(self):
@@ -61,7 +111,7 @@ class SlideshowApp:
             # Fallback defaults if no DB
             self.bg_color = 'black'
             self.manual_enabled = True
-            self.ext_str = '.jpg,.jpeg,.png,.gif,.bmp,.webp'
+            self.ext_str = DEFAULT_IMAGE_EXTENSIONS
             self.ink_screen = False
             # Ensure background is applied if root exists
             if hasattr(self, 'root'):
@@ -70,6 +120,7 @@ class SlideshowApp:
 
         try:
             # Fetch settings
+            old_bg_color = getattr(self, 'bg_color', None)
             self.bg_color = self.db.get_setting('background_color', 'black')
             str_interval = self.db.get_setting('default_interval', str(self.interval // 1000))
             new_interval = int(str_interval) * 1000
@@ -80,8 +131,10 @@ class SlideshowApp:
                 self.interval = new_interval
                 
             self.manual_enabled = self.db.get_setting('enable_manual_controls', 'True').lower() == 'true'
-            self.ext_str = self.db.get_setting('image_extensions', '.jpg,.jpeg,.png,.gif,.bmp,.webp')
+            self.ext_str = self.db.get_setting('image_extensions', DEFAULT_IMAGE_EXTENSIONS)
             self.ink_screen = self.db.get_setting('enable_inky', 'False').lower() == 'true'
+            if self.ink_screen and self._inky is None:
+                self._probe_inky()
             
             # Orientation Tracking
             new_orientation = self.db.get_setting('orientation', 'landscape').lower()
@@ -97,9 +150,10 @@ class SlideshowApp:
             
             # Dynamic Fullscreen Toggle
             new_fullscreen = self.db.get_setting('start_fullscreen', 'True').lower() == 'true'
-            current_fullscreen = self.root.attributes("-fullscreen")
-            if new_fullscreen != bool(current_fullscreen):
+            current_fullscreen = self._fullscreen
+            if new_fullscreen != current_fullscreen:
                 print(f"📺 Fullscreen toggled: {current_fullscreen} -> {new_fullscreen}")
+                self._fullscreen = new_fullscreen
                 self.root.attributes("-fullscreen", new_fullscreen)
                 self.update_cursor()
                 self.root.focus_set()
@@ -107,12 +161,15 @@ class SlideshowApp:
                 self.root.after(100, self.update_display)
 
             # Apply immediate visual changes
-            self.root.configure(bg=self.bg_color)
-            if hasattr(self, 'label'):
-                self.label.config(bg=self.bg_color)
+            if self.bg_color != old_bg_color:
+                self.root.configure(bg=self.bg_color)
+                if hasattr(self, 'label'):
+                    self.label.config(bg=self.bg_color)
                 
-            # For now, just re-scan images to pick up new files without restart
-            self.load_images()
+            # Re-scan images to pick up new files without restart, but only when the
+            # folder (its mtime changes when files are added/removed) or filter changed
+            if self._scan_signature() != self._scanned:
+                self.load_images()
             
         except Exception as e:
             print(f"⚠️ Error reloading config: {e}")
@@ -133,35 +190,110 @@ class SlideshowApp:
             self.root.unbind("<Right>")
             self.root.unbind("<Left>")
 
+    def _scan_signature(self):
+        """What load_images depends on: the extension filter and the folder mtime."""
+        try:
+            mtime = os.stat(self.image_folder).st_mtime_ns
+        except OSError:
+            mtime = None
+        return (getattr(self, 'ext_str', DEFAULT_IMAGE_EXTENSIONS), mtime)
+
+    def _scan_folder(self):
+        """Sorted paths of the image files in the slideshow folder."""
+        ext_str = getattr(self, 'ext_str', DEFAULT_IMAGE_EXTENSIONS)
+        if self._ext_suffixes[0] != ext_str:
+            self._ext_suffixes = (ext_str, tuple(parse_extensions(ext_str)))
+        suffixes = self._ext_suffixes[1]
+        # scandir reports the entry type without an extra stat per regular file;
+        # symlinks (e.g. photos linked from a USB drive) are followed
+        with os.scandir(self.image_folder) as entries:
+            return sorted(
+                entry.path for entry in entries
+                if entry.name.lower().endswith(suffixes) and entry.is_file()
+            )
+
     def load_images(self):
-        ext_str = getattr(self, 'ext_str', '.jpg,.jpeg,.png,.gif,.bmp,.webp')
-        valid_exts = {e.strip().lower() for e in ext_str.split(',')}
+        self._scanned = self._scan_signature()
         try:
-            self.images = [
-                os.path.join(self.image_folder, f) 
-                for f in sorted(os.listdir(self.image_folder))
-                if os.path.splitext(f)[1].lower() in valid_exts
-            ]
-            self.is_first_run = True
+            found = self._scan_folder()
         except Exception as e:
             print(f"Error loading images: {e}")
+            return
+
+        if not self.images:
+            self.images = found
+            self._order = list(range(len(found)))
+            self.current_image_index = 0
+            self.is_first_run = True
+            return
+
+        # Apply only the difference so the current rotation (and shuffle order) survives
+        new = set(found)
+        old = set(self.images)
+        removed = old - new
+        added = new - old
+        if not removed and not added:
+            return
+        # Play order as paths: survivors keep their place, new files go at the end
+        played = [self.images[i] for i in self._order]
+        current = played[self.current_image_index % len(played)]
+        played = [p for p in played if p not in removed]
+        played.extend(p for p in found if p in added)
+        self.images = found
+        position = {path: i for i, path in enumerate(found)}
+        self._order = [position[p] for p in played]
+        if current in new:
+            self.current_image_index = played.index(current)
+        elif self._order:
+            self.current_image_index %= len(self._order)
+        else:
+            self.current_image_index = 0
+
+        # Drop rendered frames and orientations of files that are gone
+        for key in [k for k in self._photo_cache if k[0][0] in removed]:
+            self._evict_photo(key)
+        for path in removed:
+            self._orient_cache.pop(path, None)
+
+    def _evict_photo(self, key):
+        """Remove a rendered frame from the cache and free its Tk image right away."""
+        photo, _ = self._photo_cache.pop(key)
+        # The label may still be showing it; that one goes when it is replaced
+        if photo is not getattr(self, 'photo_image', None):
+            try:
+                self.root.tk.call('image', 'delete', str(photo))
+            except Exception:
+                pass
 
     def on_resize(self, event=None):
         """Redraw current image when window is resized."""
+        # Rendered frames are keyed by window size, so a real resize makes them stale
+        if event is not None and event.widget is self.root:
+            size = (event.width, event.height)
+            if size != getattr(self, '_window_size', size):
+                for key in list(self._photo_cache):
+                    self._evict_photo(key)
+            self._window_size = size
         if hasattr(self, '_resize_timer'):
             self.root.after_cancel(self._resize_timer)
         self._resize_timer = self.root.after(100, self.update_display)
 
+    def _screen_size(self):
+        """Screen size in pixels, queried from Tk once and then cached."""
+        if self._screen_w is None:
+            self._screen_w = self.root.winfo_screenwidth()
+            self._screen_h = self.root.winfo_screenheight()
+        return self._screen_w, self._screen_h
+
     def update_cursor(self):
         """Show or hide the cursor based on fullscreen state. 
         Also moves cursor to the corner as a fallback."""
-        if self.root.attributes("-fullscreen"):
+        if self._fullscreen:
             # Hide cursor
             self.root.config(cursor="none")
             # Warp cursor to bottom-right corner as a fallback (some systems don't hide)
             try:
-                screen_w = self.root.winfo_screenwidth()
-                screen_h = self.root.winfo_screenheight()
+                screen_w, screen_h = self._screen_size()
                 self.root.event_generate('<Motion>', warp=True, x=screen_w-1, y=screen_h-1)
             except Exception:
                 pass 
@@ -169,12 +301,14 @@ class SlideshowApp:
             self.root.config(cursor="")
 
     def toggle_fullscreen(self, event=None):
-        self.root.attributes("-fullscreen", not self.root.attributes("-fullscreen"))
+        self._fullscreen = not self._fullscreen
+        self.root.attributes("-fullscreen", self._fullscreen)
         self.update_cursor()
         self.root.focus_set()
         self.root.after(100, self.update_display)
 
     def exit_fullscreen(self, event=None):
+        self._fullscreen = False
         self.root.attributes("-fullscreen", False)
         self.update_cursor()
         self.root.focus_set()
@@ -195,19 +329,22 @@ class SlideshowApp:
         if self.current_image_index >= len(self.images):
             self.current_image_index = 0
             self.is_first_run = False
-            random.shuffle(self.images)
+            # Shuffle the play order, not the scanned list
+            random.shuffle(self._order)
         self.update_display()
         self.schedule_next()
 
     def manual_next(self, event=None):
-        if not self.images: return
-        self.current_image_index = (self.current_image_index + 1) % len(self.images)
-        self.update_display()
-        self.schedule_next() # Reset timer
+        self._advance(1)
 
     def manual_prev(self, event=None):
-        if not self.images: return
-        self.current_image_index = (self.current_image_index - 1) % len(self.images)
+        self._advance(-1)
+
+    def _advance(self, delta):
+        """Step through the play order by delta (wrapping) on user input."""
+        count = len(self._order)
+        if count <= 1: return  # Nothing else to show
+        self.current_image_index = (self.current_image_index + delta) % count
         self.update_display()
         self.schedule_next() # Reset timer
 
@@ -215,50 +352,202 @@ class SlideshowApp:
         if not self.images: return
         
         try:
-            image_path = self.images[self.current_image_index]
-            img = Image.open(image_path)
-            img = ImageOps.exif_transpose(img)
+            image_path = self.images[self._order[self.current_image_index]]
+            mtime = os.stat(image_path).st_mtime_ns
+            orientation = getattr(self, 'orientation', 'landscape')
             
-            # Application Orientation
-            if getattr(self, 'orientation', 'landscape') == 'portrait':
-                img = img.rotate(270, expand=True)
-            
-            self.root.update_idletasks()
-            win_w = self.root.winfo_width()
-            win_h = self.root.winfo_height()
-            
-            if win_w <= 1: 
-                win_w = self.root.winfo_screenwidth()
-                win_h = self.root.winfo_screenheight()
+            if self._fullscreen:
+                # A fullscreen window is the screen; skip the geometry flush and Tk queries
+                win_w, win_h = self._screen_size()
+            else:
+                self.root.update_idletasks()
+                win_w = self.root.winfo_width()
+                win_h = self.root.winfo_height()
 
-            img_w, img_h = img.size
-            ratio = min(win_w/img_w, win_h/img_h)
-            new_size = (int(img_w * ratio), int(img_h * ratio))
+                if win_w <= 1:
+                    win_w, win_h = self._screen_size()
+
+            key = (image_path, mtime, win_w, win_h, orientation)
+            # img_gui is sized for the Inky panel when there is one, so frames
+            # rendered without it can't be reused once it is on (and vice versa)
+            tag = (key, self._inky_resolution if self.ink_screen else None)
+            # Tk fires Configure for things like focus changes; skip identical re-renders
+            render = (tag, self.ink_screen)
+            if render == self._last_render:
+                return
             
-            img_gui = img.resize(new_size, Image.Resampling.LANCZOS)
-            self.photo_image = ImageTk.PhotoImage(img_gui)
+            cached = self._photo_cache.get(tag)
+            if cached is not None:
+                self._photo_cache.move_to_end(tag)
+                self.photo_image, img_gui = cached
+            else:
+                prepared = self._take_prefetched(tag)
+                if prepared is None:
+                    prepared = self._prepare_frame(*tag)
+                img_gui, img_tk = prepared
+                # PhotoImage talks to Tcl, so only this last step has to run on the Tk thread
+                self.photo_image = ImageTk.PhotoImage(img_tk)
+                self._photo_cache[tag] = (self.photo_image, img_gui)
+
             self.label.config(image=self.photo_image)
+            # Evict only after the label has let go of the previous frame
+            while len(self._photo_cache) > self.photo_cache_size:
+                self._evict_photo(next(iter(self._photo_cache)))
             self.current_photo_path = image_path
+            self._last_render = render
             
-            # Force UI update so image shows up immediately (before Inky blocks)
-            self.root.update()
+            # Flush the redraw so the image shows up immediately. update_idletasks only
+            # runs pending draws; update() would also dispatch input/Configure events and
+            # could re-enter update_display.
+            self.root.update_idletasks()
 
-            # UPDATE INKY SYNCHRONOUSLY (Blocks the app until done)
+            # Inky refreshes take seconds, hand the frame to the background worker
             if self.ink_screen:
-                try:
-                    inky = auto(ask_user=False, verbose=False)
-                    # Use ImageOps.pad to fit image into inky.resolution without distortion
-                    # Centered on a white background
-                    resizedimage = ImageOps.pad(img, inky.resolution, color=(255, 255, 255))
-
-                    try:
-                        inky.set_image(resizedimage, saturation=0.5)
-                    except TypeError:
-                        inky.set_image(resizedimage)
-                    inky.show()
-                except Exception as e:
-                    print(f"⚠️ Inky update failed: {e}. Disabling Inky support for this cycle.")
-                    self.ink_screen = False
+                self._queue_inky(img_gui)
+
+            # Decode the next photo while this one is on screen
+            self._prefetch_next(win_w, win_h, orientation)
+
+        except Exception as e:
+            print(f"Error displaying image: {e}")
+
+    def _prepare_frame(self, key, inky_resolution):
+        """Decode and resample a photo without touching Tk, so it can run on any thread.
+
+        Returns (img_gui, img_tk): the resampled image kept for the Inky pad and the
+        window-sized image for the PhotoImage (often the same object).
+        """
+        image_path, mtime, win_w, win_h, orientation = key
+        # Close the file as soon as the pixels are resampled; a slideshow runs for
+        # days and would otherwise hold on to file handles and decoder buffers
+        with Image.open(image_path) as img:
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when the window is much
+            # smaller than the photo. Draft only works before the pixels are loaded,
+            # so size for either orientation since rotation hasn't happened yet.
+            cached = self._orient_cache.get(image_path)
+            if cached is not None and cached[0] == mtime:
+                orient = cached[1]
+            else:
+                # Only parses the header; pixels are still not decoded
+                orient = img.getexif().get(EXIF_ORIENTATION, 1)
+                self._orient_cache[image_path] = (mtime, orient)
+            src_w, src_h = img.size
+            def fit(w, h):
+                return max(min(w/src_w, h/src_h), min(w/src_h, h/src_w))
+            scale = fit(win_w, win_h)
+            # The Inky frame is resampled from the same decode, so a panel bigger
+            # than the window needs the larger draft
+            if inky_resolution:
+                scale = max(scale, fit(*inky_resolution))
+            if scale < 1:
+                img.draft('RGB', (math.ceil(src_w * scale), math.ceil(src_h * scale)))
+            # exif_transpose would copy the whole buffer even for upright photos
+            method = _ORIENTATION_TRANSPOSE.get(orient)
+            if method is not None:
+                img = img.transpose(method)
+
+            # Application Orientation
+            if orientation == 'portrait':
+                img = img.rotate(270, expand=True)
+
+            img_w, img_h = img.size
+            ratio = min(win_w/img_w, win_h/img_h)
+            new_size = (int(img_w * ratio), int(img_h * ratio))
 
+            # One LANCZOS pass from the full-size photo feeds both outputs. If the
+            # Inky panel is bigger than the window, resample to the panel size and
+            # derive the (smaller) Tk frame from that instead of the original.
+            if inky_resolution:
+                inky_w, inky_h = inky_resolution
+                ratio = max(ratio, min(inky_w/img_w, inky_h/img_h))
+            base_size = (int(img_w * ratio), int(img_h * ratio))
+
+            # reducing_gap box-reduces by an integer factor first (Image.reduce) while
+            # staying >= 2x the target, so LANCZOS only sees a fraction of the pixels
+            # for PNG/WebP sources that draft() can't shrink
+            img_gui = img.resize(base_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        if base_size != new_size:
+            return img_gui, img_gui.resize(new_size, Image.Resampling.BILINEAR)
+        return img_gui, img_gui
+
+    def _prefetch_next(self, win_w, win_h, orientation):
+        """Start preparing the photo after the current one on the prefetch thread."""
+        if len(self.images) < 2:
+            return
+        next_path = self.images[self._order[(self.current_image_index + 1) % len(self._order)]]
+        try:
+            mtime = os.stat(next_path).st_mtime_ns
+        except OSError:
+            return
+        key = (next_path, mtime, win_w, win_h, orientation)
+        tag = (key, self._inky_resolution if self.ink_screen else None)
+        if tag in self._photo_cache:
+            return
+        if self._prefetch is not None and self._prefetch[0] == tag:
+            return
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._prefetch = (tag, self._prefetch_executor.submit(self._prepare_frame, *tag))
+
+    def _take_prefetched(self, tag):
+        """Result of the pending prefetch if it was for this frame, else None."""
+        if self._prefetch is None or self._prefetch[0] != tag:
+            return None
+        future = self._prefetch[1]
+        self._prefetch = None
+        try:
+            # Waiting on a half-done decode still beats starting over
+            return future.result()
+        except Exception:
+            return None
+
+    def _probe_inky(self):
+        """Detect the Inky board once and cache its handle and resolution."""
+        try:
+            inky = auto(ask_user=False, verbose=False)
         except Exception as e:
-            print(f"Error displaying image: {e}")
\ No newline at end of file
+            print(f"⚠️ Inky detection failed: {e}")
+            return None
+        self._inky_resolution = inky.resolution
+        self._inky = inky
+        return inky
+
+    def _queue_inky(self, img):
+        """Queue a frame for the Inky display, replacing any frame not yet shown."""
+        if self._inky_thread is None:
+            self._inky_thread = threading.Thread(target=self._inky_worker, daemon=True)
+            self._inky_thread.start()
+        try:
+            self._inky_queue.put_nowait(img)
+        except queue.Full:
+            try:
+                self._inky_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._inky_queue.put_nowait(img)
+
+    def _inky_worker(self):
+        """Push queued frames to the Inky display. Runs off the Tk thread and never touches Tk."""
+        while True:
+            img = self._inky_queue.get()
+            try:
+                inky = self._inky or self._probe_inky()
+                if inky is None:
+                    raise RuntimeError("no Inky display detected")
+                # Use ImageOps.pad to fit image into the panel without distortion
+                # Centered on a white background. BILINEAR is plenty: the panel
+                # quantizes to a handful of colours, which hides any finer filtering.
+                resizedimage = ImageOps.pad(
+                    img, self._inky_resolution,
+                    method=Image.Resampling.BILINEAR, color=(255, 255, 255)
+                )
+
+                try:
+                    inky.set_image(resizedimage, saturation=0.5)
+                except TypeError:
+                    inky.set_image(resizedimage)
+                inky.show()
+            except Exception as e:
+                print(f"⚠️ Inky update failed: {e}. Disabling Inky support for this cycle.")
+                self._inky = None
+                self.ink_screen = False
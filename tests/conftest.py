@@ -0,0 +1,56 @@
+import os
+import sys
+import pytest
+from unittest.mock import create_autospec, patch
+import httpx
+
+# Make the project modules importable from every test module
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+def pytest_configure(config):
+    # Registered here so the marker is known even when pytest-xdist isn't installed
+    config.addinivalue_line(
+        "markers", "xdist_group(name): keep these tests on one pytest-xdist worker"
+    )
+
+
+@pytest.fixture(scope="session")
+def api_module():
+    """Import api once per session with Database mocked out.
+
+    api.py builds its Database at import time, so the patch has to be active
+    while it is imported; api.db is then pinned to the same mock for the session.
+    """
+    from database import Database
+    # Specced on the real class, so a typo'd or removed method fails the test
+    mock_db_instance = create_autospec(Database, instance=True)
+    with patch('database.Database', return_value=mock_db_instance):
+        import api
+    with patch.object(api, 'db', mock_db_instance):
+        yield api
+
+
+@pytest.fixture
+def mock_db(api_module):
+    """The session's mock Database, reset to a clean state for each test."""
+    db = api_module.db
+    db.reset_mock(return_value=True, side_effect=True)
+    db.get_settings.return_value = {}
+    return db
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # Async tests run through the anyio pytest plugin that ships with FastAPI's anyio
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def aclient(api_module, anyio_backend):
+    """One httpx client for the whole session, calling the ASGI app directly (no threads)."""
+    transport = httpx.ASGITransport(app=api_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
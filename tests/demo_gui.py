@@ -263,7 +263,7 @@ class SlideshowDemo:
         if self.app.images:
             current_idx = self.app.current_image_index
             total = len(self.app.images)
-            current_file = os.path.basename(self.app.images[current_idx])
+            current_file = os.path.basename(self.app.images[self.app._order[current_idx]])
             
             info = f"Image: {current_idx + 1}/{total}\n"
             info += f"File: {current_file}\n"
@@ -1,92 +1,183 @@
 import os
 import sys
-import unittest
+import pytest
 from unittest.mock import MagicMock, patch, mock_open
+from fastapi import HTTPException, Response
 
-# Add root folder to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-# Create a mock for Database so api.py doesn't try to access real DB/files on import
-mock_db_instance = MagicMock()
-with patch('database.Database', return_value=mock_db_instance):
-    import api
-
-class TestAPIEndpoints(unittest.TestCase):
-    def setUp(self):
-        # Reset mock before each test completely
-        mock_db_instance.reset_mock()
-        mock_db_instance.sync_with_config.side_effect = None
-        mock_db_instance.sync_with_config.return_value = MagicMock() # default
-        mock_db_instance.get_all_settings.side_effect = None
-        mock_db_instance.set_setting.side_effect = None
-
-    @patch('api.db', mock_db_instance)
-    def test_sync_config_success(self):
-        mock_db_instance.sync_with_config.return_value = True
-        response = api.sync_config()
-        self.assertEqual(response["status"], "ok")
-        self.assertEqual(response["message"], "Configuration synced from config.ini")
-        mock_db_instance.sync_with_config.assert_called_once()
-
-    @patch('api.db', mock_db_instance)
-    def test_sync_config_warning(self):
-        mock_db_instance.sync_with_config.return_value = False
-        response = api.sync_config()
-        self.assertEqual(response["status"], "warning")
-        self.assertIn("not found or invalid", response["message"])
-        mock_db_instance.sync_with_config.assert_called_once()
-
-    @patch('api.db', mock_db_instance)
-    def test_sync_config_error(self):
-        mock_db_instance.sync_with_config.side_effect = Exception("DB Error")
-        from fastapi import HTTPException
-        with self.assertRaises(HTTPException) as cm:
-            api.sync_config()
-        self.assertEqual(cm.exception.status_code, 500)
-        self.assertEqual(cm.exception.detail, "DB Error")
-
-    @patch('api.db', mock_db_instance)
-    def test_get_config(self):
-        mock_db_instance.get_all_settings.return_value = {"key": "value"}
-        response = api.get_config()
-        self.assertEqual(response, {"key": "value"})
-        mock_db_instance.get_all_settings.assert_called_once()
-
-    @patch('api.db', mock_db_instance)
-    def test_update_config(self):
-        response = api.update_config({"test_key": "test_value"})
-        self.assertEqual(response["status"], "ok")
-        mock_db_instance.set_setting.assert_called_with("test_key", "test_value")
-
-    @patch('api.open', new_callable=mock_open, read_data="<html>Dashboard</html>")
-    @patch('os.path.exists', return_value=True)
-    def test_dashboard_success(self, mock_exists, mock_file):
-        response = api.dashboard()
-        self.assertEqual(response, "<html>Dashboard</html>")
-
-    @patch('api.open', side_effect=Exception("File not found"))
-    def test_dashboard_error(self, mock_file):
-        response = api.dashboard()
-        self.assertIn("Error loading dashboard", response)
-        self.assertIn("File not found", response)
-
-    @patch('api.db', mock_db_instance)
-    def test_update_config_inky_validation_fail(self):
-        from fastapi import HTTPException
-        mock_db_instance.get_all_settings.return_value = {"enable_inky": "False", "default_interval": "5"}
-        
+# api is imported once per session with a mocked Database, see conftest.py.
+# Both api test modules share a group so pytest-xdist imports it once per worker.
+pytestmark = pytest.mark.xdist_group(name="api")
+
+
+@pytest.fixture(autouse=True)
+def provider_cache(api_module):
+    """Start every test with no configured providers, and leave none behind."""
+    api_module._provider_cache.clear()
+    yield api_module._provider_cache
+    api_module._provider_cache.clear()
+
+
+def test_sync_config_success(api_module, mock_db):
+    mock_db.sync_with_config.return_value = True
+    response = api_module.sync_config()
+    assert response["status"] == "ok"
+    assert response["message"] == "Configuration synced from config.ini"
+    mock_db.sync_with_config.assert_called_once()
+
+
+def test_sync_config_warning(api_module, mock_db):
+    mock_db.sync_with_config.return_value = False
+    response = api_module.sync_config()
+    assert response["status"] == "warning"
+    assert "not found or invalid" in response["message"]
+    mock_db.sync_with_config.assert_called_once()
+
+
+def test_sync_config_error(api_module, mock_db):
+    mock_db.sync_with_config.side_effect = Exception("DB Error")
+    with pytest.raises(HTTPException) as excinfo:
+        api_module.sync_config()
+    assert excinfo.value.status_code == 500
+    assert excinfo.value.detail == "DB Error"
+
+
+def test_get_config(api_module, mock_db):
+    mock_db.get_all_settings.return_value = {"key": "value"}
+    mock_db.settings_etag = "abc123-v3"
+    response = Response()
+    result = api_module.get_config(MagicMock(headers={}), response)
+    assert result == {"key": "value"}
+    assert response.headers["etag"] == 'W/"abc123-v3"'
+    mock_db.get_all_settings.assert_called_once()
+
+
+def test_get_config_not_modified(api_module, mock_db):
+    mock_db.settings_etag = "abc123-v3"
+    request = MagicMock(headers={"if-none-match": 'W/"abc123-v3"'})
+    result = api_module.get_config(request, Response())
+    assert result.status_code == 304
+    mock_db.get_all_settings.assert_not_called()
+
+    mock_db.settings_etag = "abc123-v4"
+    mock_db.get_all_settings.return_value = {"key": "new"}
+    assert api_module.get_config(request, Response()) == {"key": "new"}
+
+
+def test_update_config(api_module, mock_db):
+    response = api_module.update_config({"test_key": "test_value"})
+    assert response["status"] == "ok"
+    mock_db.set_settings.assert_called_once_with({"test_key": "test_value"})
+
+
+def test_dashboard_success(api_module):
+    with patch('api.open', new_callable=mock_open, read_data="<html>Dashboard</html>"):
+        response = api_module._load_dashboard()
+    assert response == "<html>Dashboard</html>"
+
+
+def test_dashboard_error(api_module):
+    with patch('api.open', side_effect=Exception("File not found")):
+        response = api_module._load_dashboard()
+    assert "Error loading dashboard" in response
+    assert "File not found" in response
+
+
+def test_dashboard_served_from_cache(api_module):
+    with patch('api._DASHBOARD_HTML', "<html>Cached</html>"), \
+            patch('api.open', side_effect=AssertionError("dashboard re-read from disk")):
+        assert api_module.dashboard() == "<html>Cached</html>"
+
+
+@pytest.mark.parametrize("interval, allowed", [("5", False), ("60", True)])
+def test_update_config_inky_validation(api_module, mock_db, interval, allowed):
+    mock_db.get_settings.return_value = {"enable_inky": "False", "default_interval": interval}
+
+    if allowed:
+        response = api_module.update_config({"enable_inky": "True"})
+        assert response["status"] == "ok"
+    else:
         # Should fail if trying to enable inky with existing small interval
-        with self.assertRaises(HTTPException) as cm:
-            api.update_config({"enable_inky": "True"})
-        self.assertEqual(cm.exception.status_code, 400)
-        self.assertIn("at least 30 seconds", cm.exception.detail)
-
-    @patch('api.db', mock_db_instance)
-    def test_update_config_inky_validation_success(self):
-        mock_db_instance.get_all_settings.return_value = {"enable_inky": "False", "default_interval": "60"}
-        
-        response = api.update_config({"enable_inky": "True"})
-        self.assertEqual(response["status"], "ok")
+        with pytest.raises(HTTPException) as excinfo:
+            api_module.update_config({"enable_inky": "True"})
+        assert excinfo.value.status_code == 400
+        assert "at least 30 seconds" in excinfo.value.detail
+        mock_db.set_settings.assert_not_called()
+
+
+def test_provider_cached_until_config_update(api_module, mock_db):
+    mock_db.get_provider_settings.return_value = {}
+
+    first = api_module._load_provider("immich")
+    assert api_module._load_provider("immich") is first
+    assert api_module._provider_validation("immich") == (False, "Server URL is required")
+    mock_db.get_provider_settings.assert_called_once_with("immich")
+
+    api_module.update_provider_config("immich", {
+        "server_url": "https://photos.example.com",
+        "api_key": "test-key",
+    })
+    # The validated instance replaces the old one without another DB read
+    updated = api_module._load_provider("immich")
+    assert updated is not first
+    assert api_module._provider_validation("immich") == (True, None)
+    assert updated.get_config()["server_url"] == "https://photos.example.com"
+    assert mock_db.get_provider_settings.call_count == 2
+    # A refresh still holding the old instance keeps its config
+    assert first.validate_config() == (False, "Server URL is required")
+
+
+def test_invalid_provider_config_leaves_cached_instance_alone(api_module, mock_db):
+    saved = {"server_url": "https://photos.example.com", "api_key": "test-key"}
+    mock_db.get_provider_settings.return_value = saved
+    provider = api_module._load_provider("immich")
+
+    with pytest.raises(HTTPException) as excinfo:
+        api_module.update_provider_config("immich", {"server_url": "photos.example.com"})
+
+    assert excinfo.value.status_code == 400
+    mock_db.set_provider_settings.assert_not_called()
+    # Still cached, still holding the saved (valid) config
+    assert provider.get_config()["server_url"] == "https://photos.example.com"
+    assert api_module._provider_cache["immich"] == (provider, (True, None))
+
+
+def test_load_provider_does_not_touch_registry_instance(api_module, mock_db):
+    from providers import get_provider
+
+    mock_db.get_provider_settings.return_value = {
+        "server_url": "https://photos.example.com",
+        "api_key": "test-key",
+    }
+
+    provider = api_module._load_provider("immich")
+
+    assert provider is not get_provider("immich")
+    assert get_provider("immich").get_config() == {}
+
+
+def test_load_provider_unknown(api_module, mock_db):
+    assert api_module._load_provider("nonexistent") is None
+    assert "nonexistent" not in api_module._provider_cache
+
+
+def test_force_sync_clears_only_images(api_module, mock_db, tmp_path):
+    target = str(tmp_path)
+    for name in ("a.jpg", "B.PNG", "notes.txt"):
+        (tmp_path / name).write_text("x")
+    (tmp_path / "sub.jpg").mkdir()
+
+    mock_db.get_setting.side_effect = lambda key, default=None: target
+    mock_db.image_extensions = frozenset({".jpg", ".png"})
+    provider = MagicMock()
+    provider.refresh.return_value.status.value = "success"
+
+    with patch.dict('api._provider_cache', {"immich": (provider, (True, None))}):
+        response = api_module.force_sync_provider("immich")
+
+    assert response["status"] == "ok"
+    assert sorted(os.listdir(target)) == ["notes.txt", "sub.jpg"]
+    provider.refresh.assert_called_once_with(target)
+
 
 if __name__ == "__main__":
-    unittest.main()
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,73 @@
+"""
+Unit tests for the provider result and config field dataclasses.
+"""
+
+from providers.base import ConfigField, RefreshResult, RefreshStatus
+
+
+def test_refresh_result_to_dict():
+    """RefreshResult should serialize to dictionary correctly."""
+    result = RefreshResult(
+        status=RefreshStatus.SUCCESS,
+        message="Downloaded 10 images",
+        downloaded=10,
+        skipped=5,
+        failed=0,
+        total=15
+    )
+    
+    assert result.to_dict() == {
+        "status": "success",
+        "message": "Downloaded 10 images",
+        "downloaded": 10,
+        "skipped": 5,
+        "failed": 0,
+        "total": 15,
+        "errors": [],
+    }
+
+
+def test_refresh_result_default_errors_list():
+    """Errors should default to empty list."""
+    result = RefreshResult(status=RefreshStatus.SUCCESS, message="OK")
+    assert result.errors == []
+
+
+def test_config_field_to_dict_basic():
+    """ConfigField should serialize basic fields."""
+    field = ConfigField(
+        key="server_url",
+        label="Server URL",
+        field_type="text",
+        required=True,
+        description="The server address"
+    )
+    
+    assert field.to_dict() == {
+        "key": "server_url",
+        "label": "Server URL",
+        "type": "text",
+        "required": True,
+        "default": None,
+        "description": "The server address",
+    }
+
+
+def test_config_field_to_dict_with_options():
+    """ConfigField should include options for select type."""
+    field = ConfigField(
+        key="format",
+        label="Format",
+        field_type="select",
+        options=[{"value": "jpg", "label": "JPEG"}, {"value": "png", "label": "PNG"}]
+    )
+    
+    assert field.to_dict() == {
+        "key": "format",
+        "label": "Format",
+        "type": "select",
+        "required": True,
+        "default": None,
+        "description": "",
+        "options": [{"value": "jpg", "label": "JPEG"}, {"value": "png", "label": "PNG"}],
+    }
@@ -1,69 +1,168 @@
-import os
-import sys
-import unittest
-import sqlite3
-import configparser
-import tempfile
-import shutil
-
-# Add root folder to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+
 from database import Database
 
-class TestConfigSync(unittest.TestCase):
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        self.db_path = os.path.join(self.test_dir, "test_config.db")
-        self.config_path = os.path.join(self.test_dir, "config.ini")
-        
-        # Change CWD so Database finds the local config.ini
-        self.old_cwd = os.getcwd()
-        os.chdir(self.test_dir)
-
-    def tearDown(self):
-        os.chdir(self.old_cwd)
-        shutil.rmtree(self.test_dir)
-
-    def test_initial_sync_with_config(self):
-        # Create a dummy config.ini
-        with open(self.config_path, "w") as f:
-            f.write("[slideshow]\n")
-            f.write("background_color = blue\n")
-            f.write("default_interval = 10\n")
-
-        db = Database(self.db_path, config_locations=[self.config_path])
-        
-        self.assertEqual(db.get_setting("background_color"), "blue")
-        self.assertEqual(db.get_setting("default_interval"), "10")
-
-    def test_sync_no_config_uses_defaults(self):
-        # No config.ini exists in self.test_dir
-        db = Database(self.db_path, config_locations=[self.config_path])
-        
-        # Should have loaded defaults
-        self.assertEqual(db.get_setting("background_color"), "black")
-        self.assertEqual(db.get_setting("default_interval"), "5")
-
-    def test_manual_sync_after_file_change(self):
-        # Initial config
-        with open(self.config_path, "w") as f:
-            f.write("[slideshow]\n")
-            f.write("background_color = red\n")
-        
-        db = Database(self.db_path, config_locations=[self.config_path])
-        self.assertEqual(db.get_setting("background_color"), "red")
-
-        # Update config file
-        with open(self.config_path, "w") as f:
-            f.write("[slideshow]\n")
-            f.write("background_color = green\n")
-        
-        # DB shouldn't change yet
-        self.assertEqual(db.get_setting("background_color"), "red")
-        
-        # Manual sync
-        db.sync_with_config()
-        self.assertEqual(db.get_setting("background_color"), "green")
-
-if __name__ == "__main__":
-    unittest.main()
+
+@pytest.fixture
+def config_path(tmp_path):
+    # Passed explicitly through config_locations, so no chdir is needed
+    return str(tmp_path / "config.ini")
+
+
+@pytest.fixture
+def db_path(request):
+    # Named shared-cache in-memory database, so tests can reopen it without touching disk
+    return f"file:{request.node.name}?mode=memory&cache=shared"
+
+
+def test_initial_sync_with_config(config_path):
+    # Create a dummy config.ini
+    with open(config_path, "w") as f:
+        f.write("[slideshow]\n")
+        f.write("background_color = blue\n")
+        f.write("default_interval = 10\n")
+
+    db = Database(":memory:", config_locations=[config_path])
+
+    assert db.get_setting("background_color") == "blue"
+    assert db.get_setting("default_interval") == "10"
+
+
+def test_sync_no_config_uses_defaults(config_path):
+    # No config.ini exists in tmp_path
+    db = Database(":memory:", config_locations=[config_path])
+
+    # Should have loaded defaults
+    assert db.get_setting("background_color") == "black"
+    assert db.get_setting("default_interval") == "5"
+
+
+def test_manual_sync_after_file_change(config_path):
+    # Initial config
+    with open(config_path, "w") as f:
+        f.write("[slideshow]\n")
+        f.write("background_color = red\n")
+
+    db = Database(":memory:", config_locations=[config_path])
+    assert db.get_setting("background_color") == "red"
+
+    # Update config file
+    with open(config_path, "w") as f:
+        f.write("[slideshow]\n")
+        f.write("background_color = green\n")
+
+    # DB shouldn't change yet
+    assert db.get_setting("background_color") == "red"
+
+    # Manual sync
+    db.sync_with_config()
+    assert db.get_setting("background_color") == "green"
+
+
+def test_set_setting_updates_cached_reads(db_path, config_path):
+    db = Database(db_path, config_locations=[config_path])
+    assert db.get_all_settings()["background_color"] == "black"
+
+    db.set_setting("background_color", "purple")
+    assert db.get_setting("background_color") == "purple"
+    assert db.get_all_settings()["background_color"] == "purple"
+
+    # A fresh instance reads the same value back from the database
+    other = Database(db_path, config_locations=[config_path])
+    assert other.get_setting("background_color") == "purple"
+
+
+def test_set_settings_batch(db_path, config_path):
+    db = Database(db_path, config_locations=[config_path])
+    db.set_settings({"background_color": "white", "default_interval": 42})
+
+    assert db.get_setting("background_color") == "white"
+    assert db.get_setting("default_interval") == "42"
+
+    other = Database(db_path, config_locations=[config_path])
+    assert other.get_setting("default_interval") == "42"
+
+
+def test_sync_reuses_matched_config_until_locations_change(tmp_path, config_path):
+    with open(config_path, "w") as f:
+        f.write("[slideshow]\nbackground_color = red\n")
+    db = Database(":memory:", config_locations=[config_path])
+    assert db._config_path == config_path
+
+    other_path = str(tmp_path / "other.ini")
+    with open(other_path, "w") as f:
+        f.write("[slideshow]\nbackground_color = teal\n")
+
+    db.config_locations = [other_path]
+    assert db._config_path is None
+    db.sync_with_config()
+    assert db.get_setting("background_color") == "teal"
+
+
+def test_in_memory_database(config_path):
+    db = Database(":memory:", config_locations=[config_path])
+    assert db.get_setting("background_color") == "black"
+    db.close()
+
+
+def test_startup_skips_unchanged_config(db_path, config_path):
+    with open(config_path, "w") as f:
+        f.write("[slideshow]\nbackground_color = red\n")
+    db = Database(db_path, config_locations=[config_path])
+    db.set_setting("background_color", "orange")
+
+    # Unchanged file: startup keeps the value set through the API
+    db = Database(db_path, config_locations=[config_path])
+    assert db.get_setting("background_color") == "orange"
+
+    # An explicit sync always re-applies the file
+    assert db.sync_with_config()
+    assert db.get_setting("background_color") == "red"
+
+
+def test_image_extensions(config_path):
+    db = Database(":memory:", config_locations=[config_path])
+    assert ".webp" in db.image_extensions
+
+    db.set_setting("image_extensions", " .JPG, .png ,")
+    assert db.image_extensions == frozenset({".jpg", ".png"})
+
+
+def test_reads_see_writes_from_other_instance(db_path, config_path):
+    # main.py and api.py each own a Database on the same file
+    slideshow_db = Database(db_path, config_locations=[config_path])
+    api_db = Database(db_path, config_locations=[config_path])
+    assert slideshow_db.get_setting("background_color") == "black"
+    version = slideshow_db.settings_version
+
+    api_db.set_setting("background_color", "red")
+    assert slideshow_db.settings_version != version
+    assert slideshow_db.get_setting("background_color") == "red"
+    assert slideshow_db.get_all_settings()["background_color"] == "red"
+
+
+def test_settings_etag_differs_between_instances(db_path, config_path):
+    # A restarted process starts its version counter again; its ETags must not collide
+    first = Database(db_path, config_locations=[config_path])
+    second = Database(db_path, config_locations=[config_path])
+    assert first.settings_etag != second.settings_etag
+
+    etag = first.settings_etag
+    first.set_setting("background_color", "red")
+    assert first.settings_etag != etag
+
+
+def test_refresh_if_changed_sees_other_connection(db_path, config_path):
+    db = Database(db_path, config_locations=[config_path])
+    other = Database(db_path, config_locations=[config_path])
+    assert db.get_setting("background_color") == "black"
+    assert not db.refresh_if_changed()
+
+    other.set_setting("background_color", "red")
+    assert db.refresh_if_changed()
+    assert db.get_setting("background_color") == "red"
+    assert not db.refresh_if_changed()
+
+    # The connection's own writes never trigger a refresh
+    db.set_setting("background_color", "green")
+    assert not db.refresh_if_changed()
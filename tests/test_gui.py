@@ -10,10 +10,27 @@ import tkinter as tk
 import sys
 import os
 import time
-import sys
-import os
+from collections import namedtuple
+from unittest.mock import patch
+from PIL import Image
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from slideshow import SlideshowApp
+from database import Database
+
+# config.ini is read once at import into an in-memory settings store
+_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config.ini')
+_CONFIG_DB = Database(":memory:", config_locations=[_CONFIG_PATH])
+# SlideshowApp takes its interval and window mode from the DB, which would
+# override the constructor arguments with config.ini's 60 s and fullscreen
+_CONFIG_DB.set_settings({'default_interval': '1', 'start_fullscreen': 'False'})
+
+# How often wait_for re-checks its condition
+POLL_MS = 50
+
+LOG_SYMBOLS = {"INFO": "ℹ", "PASS": "✓", "FAIL": "✗", "TEST": "▶"}
+
+# Stand-in for the Tk event passed to key handlers
+KeyEvent = namedtuple('KeyEvent', ['char', 'keysym'])
 
 class GUITester:
     """Automated GUI tester for the slideshow application."""
@@ -32,36 +49,34 @@ class GUITester:
             ("Completing test suite", self.finish_tests)
         ]
     
+    def format_log(self, message, status="INFO", timestamp=None):
+        """Format one log line."""
+        if timestamp is None:
+            timestamp = time.strftime("%H:%M:%S")
+        symbol = LOG_SYMBOLS.get(status, "•")
+        return f"[{timestamp}] {symbol} {message}"
+
     def log(self, message, status="INFO"):
         """Log test messages."""
-        timestamp = time.strftime("%H:%M:%S")
-        symbols = {"INFO": "ℹ", "PASS": "✓", "FAIL": "✗", "TEST": "▶"}
-        symbol = symbols.get(status, "•")
-        print(f"[{timestamp}] {symbol} {message}")
+        print(self.format_log(message, status))
     
-    def test_windowed_mode(self):
-        """Test 1: Start in windowed mode."""
-        self.log("Test 1: Starting slideshow in windowed mode", "TEST")
-        
+    def setup_once(self, test_images_path):
+        """Create the Tk root and the slideshow shared by every test step."""
         self.root = tk.Tk()
         self.root.geometry("800x600")
         
-        # Load config
-        import configparser
-        config = configparser.ConfigParser()
-        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.ini')
-        config.read(config_path)
-        
-        test_images_path = os.path.join(os.path.dirname(__file__), 'test_images')
-        
         # Create app in windowed mode
         self.app = SlideshowApp(
             self.root, 
             test_images_path, 
-            interval=2, 
+            interval=1,
             fullscreen=False,
-            config=config['slideshow'] if 'slideshow' in config else {}
+            db=_CONFIG_DB
         )
+
+    def test_windowed_mode(self):
+        """Test 1: Start in windowed mode."""
+        self.log("Test 1: Starting slideshow in windowed mode", "TEST")
         
         # Add test status label
         self.status_label = tk.Label(
@@ -77,23 +92,23 @@ class GUITester:
         self.log("Slideshow started in windowed mode", "PASS")
         self.test_results.append(("Windowed mode", True))
         
-        # Schedule next test
-        self.root.after(3000, self.run_next_test)
+        # Move on as soon as the first image is on screen
+        self.wait_for(lambda: getattr(self.app, 'photo_image', None) is not None,
+                      self.run_next_test, timeout_ms=3000)
     
     def test_image_display(self):
         """Test 2: Verify images are displaying."""
         self.log("Test 2: Verifying image display", "TEST")
         self.update_status("Test 2/6: Verifying Image Display")
         
-        if self.app.photo_image is not None:
+        if getattr(self.app, 'photo_image', None) is not None:
             self.log("Image is displayed correctly", "PASS")
             self.test_results.append(("Image display", True))
         else:
             self.log("No image displayed", "FAIL")
             self.test_results.append(("Image display", False))
         
-        # Schedule next test
-        self.root.after(3000, self.run_next_test)
+        self.root.after_idle(self.run_next_test)
     
     def test_image_rotation(self):
         """Test 3: Test automatic image rotation."""
@@ -104,7 +119,10 @@ class GUITester:
         initial_index = self.app.current_image_index
         self.log(f"Current image index: {initial_index}")
         
-        # Wait for rotation (2 second interval + buffer)
+        # Wait for rotation (1 second interval + buffer)
+        def rotated():
+            return self.app.current_image_index != initial_index or len(self.app.images) == 1
+
         def check_rotation():
             new_index = self.app.current_image_index
             if new_index != initial_index or len(self.app.images) == 1:
@@ -114,9 +132,9 @@ class GUITester:
                 self.log("Image did not rotate", "FAIL")
                 self.test_results.append(("Image rotation", False))
             
-            self.root.after(1000, self.run_next_test)
+            self.root.after_idle(self.run_next_test)
         
-        self.root.after(2500, check_rotation)
+        self.wait_for(rotated, check_rotation, timeout_ms=2500)
     
     def test_fullscreen_toggle(self):
         """Test 4: Test fullscreen toggle."""
@@ -139,9 +157,9 @@ class GUITester:
             # Toggle back to windowed
             self.log("Switching back to windowed mode...")
             self.app.exit_fullscreen()
-            self.root.after(2000, self.run_next_test)
+            self.wait_for(self.is_windowed, self.run_next_test, timeout_ms=2000)
         
-        self.root.after(2000, check_fullscreen)
+        self.wait_for(self.is_fullscreen, check_fullscreen, timeout_ms=2000)
     
     def test_keyboard_controls(self):
         """Test 5: Test keyboard controls."""
@@ -150,7 +168,7 @@ class GUITester:
         
         # Test 'f' key for fullscreen
         self.log("Simulating 'f' key press...")
-        event = type('Event', (), {'char': 'f', 'keysym': 'f'})()
+        event = KeyEvent(char='f', keysym='f')
         self.app.toggle_fullscreen(event)
         
         def check_f_key():
@@ -161,9 +179,9 @@ class GUITester:
             self.app.exit_fullscreen()
             
             self.test_results.append(("Keyboard controls", True))
-            self.root.after(2000, self.run_next_test)
+            self.wait_for(self.is_windowed, self.run_next_test, timeout_ms=2000)
         
-        self.root.after(1000, check_f_key)
+        self.wait_for(self.is_fullscreen, check_f_key, timeout_ms=1000)
     
     def finish_tests(self):
         """Test 6: Finish and show results."""
@@ -178,9 +196,13 @@ class GUITester:
         self.log(f"GUI TEST RESULTS: {passed}/{total} tests passed")
         self.log("=" * 60)
         
+        # One timestamp and one write for the whole summary
+        timestamp = time.strftime("%H:%M:%S")
+        lines = []
         for test_name, result in self.test_results:
             status = "PASS" if result else "FAIL"
-            self.log(f"{test_name}: {status}", status)
+            lines.append(self.format_log(f"{test_name}: {status}", status, timestamp))
+        print("\n".join(lines))
         
         # Update status with final results
         result_text = f"✓ All Tests Complete: {passed}/{total} Passed"
@@ -208,6 +230,24 @@ class GUITester:
         # Auto-close after 10 seconds
         self.root.after(10000, self.root.quit)
     
+    def wait_for(self, condition, then, timeout_ms):
+        """Call then() as soon as condition() holds, or once timeout_ms has passed."""
+        deadline = time.monotonic() + timeout_ms / 1000
+
+        def poll():
+            if condition() or time.monotonic() >= deadline:
+                then()
+            else:
+                self.root.after(POLL_MS, poll)
+
+        poll()
+
+    def is_fullscreen(self):
+        return self.root.getboolean(self.root.attributes("-fullscreen"))
+
+    def is_windowed(self):
+        return not self.is_fullscreen()
+
     def update_status(self, text):
         """Update the status label."""
         if hasattr(self, 'status_label'):
@@ -236,12 +276,17 @@ class GUITester:
             self.log(f"Run: python3 {os.path.join('tests', 'create_test_images.py')}", "INFO")
             return 1
         
-        # Start first test
-        test_name, test_func = self.tests[0]
-        test_func()
-        
-        # Run the GUI
-        self.root.mainloop()
+        # The steps only check that frames get shown, not what they contain, so skip
+        # decoding the real files and hand the slideshow a small solid image instead
+        with patch('PIL.Image.open', side_effect=lambda path, *args, **kwargs: Image.new('RGB', (100, 100), 'gray')):
+            self.setup_once(test_images_path)
+
+            # Start first test
+            test_name, test_func = self.tests[0]
+            test_func()
+
+            # Run the GUI
+            self.root.mainloop()
         
         # Return exit code
         total = len(self.test_results)
@@ -1,58 +1,62 @@
-import os
 import sys
-import unittest
-from unittest.mock import MagicMock, patch
-from fastapi.testclient import TestClient
-
-# Add root folder to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-# Create a mock for Database so api.py doesn't try to access real DB on import
-mock_db_instance = MagicMock()
-with patch('database.Database', return_value=mock_db_instance):
-    from api import app
-
-client = TestClient(app)
-
-class TestImagePreview(unittest.TestCase):
-    
-    def test_current_image_not_set(self):
-        # Clear state
-        if hasattr(app.state, 'slideshow'):
-            delattr(app.state, 'slideshow')
-            
-        response = client.get("/current-image")
-        self.assertEqual(response.status_code, 404)
-        self.assertIn("No image currently displayed", response.json()["detail"])
-
-    def test_current_image_success(self):
-        # Create a real dummy file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-            tmp.write(b"fake data")
-            tmp_path = tmp.name
-
-        try:
-            # Mock slideshow app
-            mock_slideshow = MagicMock()
-            mock_slideshow.current_photo_path = tmp_path
-            app.state.slideshow = mock_slideshow
-            
-            response = client.get("/current-image")
-            self.assertEqual(response.status_code, 200)
-            self.assertEqual(response.headers["content-type"], "image/jpeg")
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-            
-    def test_current_image_file_missing(self):
-        mock_slideshow = MagicMock()
-        mock_slideshow.current_photo_path = "/tmp/non_existent.jpg"
-        app.state.slideshow = mock_slideshow
-        
-        with patch('os.path.exists', return_value=False):
-            response = client.get("/current-image")
-            self.assertEqual(response.status_code, 404)
+import pytest
+from types import SimpleNamespace
+
+# api is imported once per session with a mocked Database, see conftest.py.
+# Both api test modules share a group so pytest-xdist imports it once per worker.
+pytestmark = [pytest.mark.xdist_group(name="api"), pytest.mark.anyio]
+
+
+@pytest.fixture
+def slideshow_state(api_module):
+    """app.state with no slideshow attached, cleaned up again after the test."""
+    state = api_module.app.state
+    if hasattr(state, 'slideshow'):
+        delattr(state, 'slideshow')
+    yield state
+    if hasattr(state, 'slideshow'):
+        delattr(state, 'slideshow')
+
+
+async def test_current_image_not_set(aclient, slideshow_state):
+    response = await aclient.get("/current-image")
+    assert response.status_code == 404
+    assert "No image currently displayed" in response.json()["detail"]
+
+
+async def test_current_image_success(aclient, slideshow_state, tmp_path):
+    # Create a real dummy file
+    image = tmp_path / "fake.jpg"
+    image.write_bytes(b"fake data")
+
+    # The endpoint only reads current_photo_path from the slideshow
+    slideshow_state.slideshow = SimpleNamespace(current_photo_path=str(image))
+
+    response = await aclient.get("/current-image")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+
+
+async def test_current_image_file_missing(aclient, slideshow_state, tmp_path):
+    slideshow_state.slideshow = SimpleNamespace(current_photo_path=str(tmp_path / "non_existent.jpg"))
+
+    response = await aclient.get("/current-image")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("interval, cache_control", [
+    (7500, "public, max-age=7"),  # Slideshow interval is in milliseconds
+    (None, None),
+])
+async def test_current_image_cache_control(aclient, slideshow_state, tmp_path, interval, cache_control):
+    image = tmp_path / "fake.jpg"
+    image.write_bytes(b"fake data")
+    slideshow_state.slideshow = SimpleNamespace(current_photo_path=str(image), interval=interval)
+
+    response = await aclient.get("/current-image")
+    assert response.status_code == 200
+    assert response.headers.get("cache-control") == cache_control
+
 
 if __name__ == "__main__":
-    unittest.main()
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,41 @@
+"""
+Unit tests for the provider registry.
+"""
+
+import providers
+from providers import get_all_providers, get_provider, list_providers
+from providers.base import BaseImageProvider
+
+
+def test_list_providers():
+    """list_providers should return registered provider names."""
+    assert "immich" in list_providers()
+
+
+def test_get_provider():
+    """get_provider should return the shared provider instance."""
+    provider = get_provider("immich")
+    
+    assert isinstance(provider, BaseImageProvider)
+    assert provider.name == "immich"
+    assert get_provider("immich") is provider
+
+
+def test_list_providers_does_not_import_lazy_providers(monkeypatch):
+    """Listing providers should not import or instantiate lazily registered ones."""
+    monkeypatch.setitem(providers._LAZY_PROVIDERS, "lazy", ".missing_module:Missing")
+    
+    assert "lazy" in list_providers()
+
+
+def test_get_provider_unknown():
+    """get_provider should return None for unknown provider."""
+    assert get_provider("nonexistent") is None
+
+
+def test_get_all_providers():
+    """get_all_providers should return dict of all providers."""
+    instances = get_all_providers()
+    
+    assert "immich" in instances
+    assert type(instances["immich"]).__name__ == "ImmichProvider"
@@ -1,356 +1,359 @@
 """
-Unit tests for the provider system.
-
-Tests the base provider interface, Immich provider, and registry functionality.
+Unit tests for the Immich provider.
 """
 
+import dataclasses
 import os
 import sys
-import unittest
-from unittest.mock import MagicMock, patch, PropertyMock
-import tempfile
-import shutil
+from types import SimpleNamespace
+
+import pytest
 
 # Add root folder to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from providers.base import (
     BaseImageProvider, 
-    ConfigField, 
     RefreshResult, 
     RefreshStatus
 )
 from providers.immich import ImmichProvider
 
 
-class TestRefreshResult(unittest.TestCase):
-    """Tests for RefreshResult dataclass."""
-    
-    def test_to_dict(self):
-        """RefreshResult should serialize to dictionary correctly."""
-        result = RefreshResult(
-            status=RefreshStatus.SUCCESS,
-            message="Downloaded 10 images",
-            downloaded=10,
-            skipped=5,
-            failed=0,
-            total=15
-        )
-        
-        data = result.to_dict()
-        
-        self.assertEqual(data["status"], "success")
-        self.assertEqual(data["message"], "Downloaded 10 images")
-        self.assertEqual(data["downloaded"], 10)
-        self.assertEqual(data["skipped"], 5)
-        self.assertEqual(data["failed"], 0)
-        self.assertEqual(data["total"], 15)
-        self.assertEqual(data["errors"], [])
-    
-    def test_default_errors_list(self):
-        """Errors should default to empty list."""
-        result = RefreshResult(status=RefreshStatus.SUCCESS, message="OK")
-        self.assertEqual(result.errors, [])
-
-
-class TestConfigField(unittest.TestCase):
-    """Tests for ConfigField dataclass."""
-    
-    def test_to_dict_basic(self):
-        """ConfigField should serialize basic fields."""
-        field = ConfigField(
-            key="server_url",
-            label="Server URL",
-            field_type="text",
-            required=True,
-            description="The server address"
-        )
-        
-        data = field.to_dict()
-        
-        self.assertEqual(data["key"], "server_url")
-        self.assertEqual(data["label"], "Server URL")
-        self.assertEqual(data["type"], "text")
-        self.assertTrue(data["required"])
-        self.assertEqual(data["description"], "The server address")
-    
-    def test_to_dict_with_options(self):
-        """ConfigField should include options for select type."""
-        field = ConfigField(
-            key="format",
-            label="Format",
-            field_type="select",
-            options=[{"value": "jpg", "label": "JPEG"}, {"value": "png", "label": "PNG"}]
-        )
-        
-        data = field.to_dict()
-        
-        self.assertIn("options", data)
-        self.assertEqual(len(data["options"]), 2)
-
-
-class TestImmichProvider(unittest.TestCase):
-    """Tests for ImmichProvider implementation."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.provider = ImmichProvider()
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_name_and_display_name(self):
-        """Provider should have correct identifiers."""
-        self.assertEqual(self.provider.name, "immich")
-        self.assertEqual(self.provider.display_name, "Immich")
-    
-    def test_get_config_fields(self):
-        """Provider should return expected configuration fields."""
-        fields = self.provider.get_config_fields()
-        
-        field_keys = [f.key for f in fields]
-        self.assertIn("server_url", field_keys)
-        self.assertIn("api_key", field_keys)
-        self.assertIn("album_name", field_keys)
-        self.assertIn("skip_existing", field_keys)
-    
-    def test_configure(self):
-        """Provider should store configuration."""
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "test-api-key",
-            "album_name": "Test Album"
-        })
-        
-        config = self.provider.get_config()
-        self.assertEqual(config["server_url"], "https://photos.example.com")
-        self.assertNotEqual(config["api_key"], "test-api-key")  # Should be masked
-        self.assertEqual(config["album_name"], "Test Album")
-    
-    def test_validate_config_missing_url(self):
-        """Validation should fail without server URL."""
-        self.provider.configure({"api_key": "test-key"})
-        
-        is_valid, error = self.provider.validate_config()
-        
-        self.assertFalse(is_valid)
-        self.assertIn("Server URL", error)
-    
-    def test_validate_config_missing_key(self):
-        """Validation should fail without API key."""
-        self.provider.configure({"server_url": "https://photos.example.com"})
-        
-        is_valid, error = self.provider.validate_config()
-        
-        self.assertFalse(is_valid)
-        self.assertIn("API Key", error)
-    
-    def test_validate_config_invalid_url(self):
-        """Validation should fail with invalid URL scheme."""
-        self.provider.configure({
-            "server_url": "photos.example.com",
-            "api_key": "test-key"
-        })
-        
-        is_valid, error = self.provider.validate_config()
-        
-        self.assertFalse(is_valid)
-        self.assertIn("http://", error)
-    
-    def test_validate_config_success(self):
-        """Validation should pass with valid config."""
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "test-api-key"
-        })
-        
-        is_valid, error = self.provider.validate_config()
-        
-        self.assertTrue(is_valid)
-        self.assertIsNone(error)
-    
-    def test_get_config_schema(self):
-        """get_config_schema should return list of dictionaries."""
-        schema = self.provider.get_config_schema()
-        
-        self.assertIsInstance(schema, list)
-        self.assertTrue(all(isinstance(item, dict) for item in schema))
-        self.assertTrue(all("key" in item for item in schema))
-    
-    @patch('providers.immich.ImmichProvider._get_client')
-    def test_test_connection_success(self, mock_get_client):
-        """test_connection should return success when auth works."""
-        mock_client = MagicMock()
-        mock_client.check_auth.return_value = {"user": "test"}
-        mock_get_client.return_value = mock_client
-        
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "test-key"
-        })
-        
-        success, message = self.provider.test_connection()
-        
-        self.assertTrue(success)
-        self.assertIn("Connected", message)
-    
-    @patch('providers.immich.ImmichProvider._get_client')
-    def test_test_connection_failure(self, mock_get_client):
-        """test_connection should return failure when auth fails."""
-        mock_client = MagicMock()
-        mock_client.check_auth.return_value = None
-        mock_get_client.return_value = mock_client
-        
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "bad-key"
-        })
-        
-        success, message = self.provider.test_connection()
-        
-        self.assertFalse(success)
-        self.assertIn("Authentication failed", message)
-    
-    def test_test_connection_invalid_config(self):
-        """test_connection should fail with invalid config."""
-        # No configuration
-        success, message = self.provider.test_connection()
-        
-        self.assertFalse(success)
-        self.assertIn("Configuration error", message)
-    
-    @patch('providers.immich.ImmichProvider._get_client')
-    def test_refresh_downloads_assets(self, mock_get_client):
-        """refresh should download assets to target folder."""
-        mock_client = MagicMock()
-        mock_client.list_assets.return_value = [
-            {"id": "asset-1", "originalFileName": "photo1.jpg"},
-            {"id": "asset-2", "originalFileName": "photo2.jpg"},
-        ]
-        mock_get_client.return_value = mock_client
-        
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "test-key"
-        })
-        
-        result = self.provider.refresh(self.temp_dir)
-        
-        self.assertEqual(result.status, RefreshStatus.SUCCESS)
-        self.assertEqual(result.downloaded, 2)
-        self.assertEqual(mock_client.download_asset.call_count, 2)
-    
-    @patch('providers.immich.ImmichProvider._get_client')
-    def test_refresh_skips_existing(self, mock_get_client):
-        """refresh should skip existing files when skip_existing is True."""
-        # Create an existing file
-        existing_file = os.path.join(self.temp_dir, "photo1.jpg")
-        with open(existing_file, 'w') as f:
-            f.write("existing")
-        
-        mock_client = MagicMock()
-        mock_client.list_assets.return_value = [
-            {"id": "asset-1", "originalFileName": "photo1.jpg"},
-            {"id": "asset-2", "originalFileName": "photo2.jpg"},
-        ]
-        mock_get_client.return_value = mock_client
-        
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "test-key",
-            "skip_existing": "True"
-        })
-        
-        result = self.provider.refresh(self.temp_dir)
-        
-        self.assertEqual(result.downloaded, 1)
-        self.assertEqual(result.skipped, 1)
-    
-    @patch('providers.immich.ImmichProvider._get_client')
-    def test_refresh_from_album(self, mock_get_client):
-        """refresh should download from specific album when configured."""
-        mock_client = MagicMock()
-        mock_client.find_album.return_value = {"id": "album-123", "albumName": "Vacation"}
-        mock_client.get_album.return_value = {
-            "id": "album-123",
-            "assets": [{"id": "asset-1", "originalFileName": "beach.jpg"}]
-        }
-        mock_get_client.return_value = mock_client
-        
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "test-key",
-            "album_name": "Vacation"
-        })
-        
-        result = self.provider.refresh(self.temp_dir)
-        
-        mock_client.find_album.assert_called_with("Vacation")
-        self.assertEqual(result.downloaded, 1)
-    
-    def test_refresh_invalid_config(self):
-        """refresh should fail with invalid config."""
-        result = self.provider.refresh(self.temp_dir)
-        
-        self.assertEqual(result.status, RefreshStatus.FAILED)
-        self.assertIn("Configuration error", result.message)
-    
-    @patch('providers.immich.ImmichProvider._get_client')
-    def test_refresh_no_images(self, mock_get_client):
-        """refresh should return NO_IMAGES when source is empty."""
-        mock_client = MagicMock()
-        mock_client.list_assets.return_value = []
-        mock_get_client.return_value = mock_client
-        
-        self.provider.configure({
-            "server_url": "https://photos.example.com",
-            "api_key": "test-key"
-        })
-        
-        result = self.provider.refresh(self.temp_dir)
-        
-        self.assertEqual(result.status, RefreshStatus.NO_IMAGES)
-
-
-class TestProviderRegistry(unittest.TestCase):
-    """Tests for provider registry functions."""
-    
-    def test_list_providers(self):
-        """list_providers should return registered provider names."""
-        from providers import list_providers
-        
-        names = list_providers()
-        
-        self.assertIn("immich", names)
-    
-    def test_get_provider(self):
-        """get_provider should return provider instance."""
-        from providers import get_provider
-        
-        provider = get_provider("immich")
-        
-        self.assertIsNotNone(provider)
-        self.assertIsInstance(provider, ImmichProvider)
-    
-    def test_get_provider_unknown(self):
-        """get_provider should return None for unknown provider."""
-        from providers import get_provider
-        
-        provider = get_provider("nonexistent")
-        
-        self.assertIsNone(provider)
-    
-    def test_get_all_providers(self):
-        """get_all_providers should return dict of all providers."""
-        from providers import get_all_providers
-        
-        providers = get_all_providers()
-        
-        self.assertIn("immich", providers)
-        self.assertIsInstance(providers["immich"], ImmichProvider)
+def fake_download(asset_id, output_path):
+    """Stand-in for ImmichClient.download_asset that writes a small file."""
+    with open(output_path, "wb") as f:
+        f.write(b"image")
+    return True
+
+
+def fake_client():
+    """Plain stand-in for ImmichClient.
+    
+    Lookup methods return the value set in `returns` under their name (None
+    otherwise) and are recorded in `calls`; download_asset delegates to
+    `download` and records the asset id in `downloads`.
+    """
+    client = SimpleNamespace(calls=[], downloads=[], returns={}, download=fake_download)
+    
+    def lookup(name):
+        def call(*args):
+            client.calls.append((name,) + args)
+            return client.returns.get(name)
+        return call
+    
+    for name in ("check_auth", "list_assets", "find_album", "get_album"):
+        setattr(client, name, lookup(name))
+    
+    def download_asset(asset_id, output_path):
+        client.downloads.append(asset_id)
+        return client.download(asset_id, output_path)
+    
+    client.download_asset = download_asset
+    return client
+
+
+@pytest.fixture(scope="module")
+def provider_template():
+    return ImmichProvider()
+
+
+@pytest.fixture
+def provider(provider_template):
+    """The module's shared provider, reset to an unconfigured state for each test."""
+    provider_template.reset()
+    return provider_template
+
+
+@pytest.fixture
+def configured(request, provider):
+    """The provider with valid settings; indirect parametrization adds or overrides settings."""
+    provider.configure({
+        "server_url": "https://photos.example.com",
+        "api_key": "test-key",
+        **getattr(request, "param", {}),
+    })
+    return provider
+
+
+@pytest.fixture(autouse=True)
+def client(monkeypatch):
+    """Fake client handed out by ImmichProvider._get_client for every test."""
+    client = fake_client()
+    monkeypatch.setattr(ImmichProvider, "_get_client", lambda self: client)
+    return client
+
+
+def test_name_and_display_name(provider):
+    """Provider should have correct identifiers."""
+    assert provider.name == "immich"
+    assert provider.display_name == "Immich"
+
+
+def test_get_config_fields(provider):
+    """Provider should return expected configuration fields."""
+    fields = provider.get_config_fields()
+    
+    field_keys = [f.key for f in fields]
+    assert "server_url" in field_keys
+    assert "api_key" in field_keys
+    assert "album_name" in field_keys
+    assert "skip_existing" in field_keys
+
+
+def test_reset_clears_configuration(provider):
+    """reset should drop config and the last refresh result."""
+    provider.configure({"server_url": "https://photos.example.com", "api_key": "test-key"})
+    provider._last_result = RefreshResult(status=RefreshStatus.SUCCESS, message="OK")
+    
+    provider.reset()
+    
+    assert provider.get_config() == {}
+    assert provider.get_last_result() is None
+    assert provider.validate_config() == (False, "Server URL is required")
+
+
+def test_configure(provider):
+    """Provider should store configuration."""
+    provider.configure({
+        "server_url": "https://photos.example.com",
+        "api_key": "test-api-key",
+        "album_name": "Test Album"
+    })
+    
+    config = provider.get_config()
+    assert config["server_url"] == "https://photos.example.com"
+    assert config["api_key"] != "test-api-key"  # Should be masked
+    assert config["album_name"] == "Test Album"
+
+
+@pytest.mark.parametrize("settings, expected_valid, error_part", [
+    ({"api_key": "test-key"}, False, "Server URL"),
+    ({"server_url": "https://photos.example.com"}, False, "API Key"),
+    ({"server_url": "photos.example.com", "api_key": "test-key"}, False, "http://"),
+    ({"server_url": "https://photos.example.com", "api_key": "test-api-key"}, True, None),
+], ids=["missing_url", "missing_key", "invalid_url", "success"])
+def test_validate_config(provider, settings, expected_valid, error_part):
+    """Validation should report the first missing or invalid setting."""
+    provider.configure(settings)
+    
+    is_valid, error = provider.validate_config()
+    
+    assert is_valid is expected_valid
+    if error_part is None:
+        assert error is None
+    else:
+        assert error_part in error
+
+
+def test_config_fields_are_shared_and_frozen(provider):
+    """Config fields are built once per class and cannot be modified."""
+    fields = provider.get_config_fields()
+    
+    assert all(a is b for a, b in zip(fields, ImmichProvider().get_config_fields()))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        fields[0].required = False
+
+
+def test_get_config_schema(provider):
+    """get_config_schema should return list of dictionaries."""
+    schema = provider.get_config_schema()
+    
+    assert isinstance(schema, list)
+    assert all(isinstance(item, dict) for item in schema)
+    assert all("key" in item for item in schema)
+
+
+def test_get_config_schema_shared_per_class(provider):
+    """get_config_schema should be built once per provider class."""
+    schema = provider.get_config_schema()
+    
+    assert ImmichProvider().get_config_schema() is schema
+    assert "_config_schema" not in BaseImageProvider.__dict__
+
+
+def test_test_connection_success(configured, client):
+    """test_connection should return success when auth works."""
+    client.returns["check_auth"] = {"user": "test"}
+    
+    success, message = configured.test_connection()
+    
+    assert success
+    assert "Connected" in message
+
+
+def test_test_connection_failure(configured):
+    """test_connection should return failure when auth fails."""
+    success, message = configured.test_connection()
+    
+    assert not success
+    assert "Authentication failed" in message
+
+
+def test_test_connection_invalid_config(provider):
+    """test_connection should fail with invalid config."""
+    # No configuration
+    success, message = provider.test_connection()
+    
+    assert not success
+    assert "Configuration error" in message
+
+
+@pytest.mark.parametrize("filenames, expected_status", [
+    ([], RefreshStatus.NO_IMAGES),
+    (["photo1.jpg"], RefreshStatus.SUCCESS),
+    (["photo1.jpg", "photo2.jpg"], RefreshStatus.SUCCESS),
+], ids=["no_assets", "one_asset", "two_assets"])
+def test_refresh_downloads_assets(configured, client, tmp_path, filenames, expected_status):
+    """refresh should download every asset to the target folder (NO_IMAGES when there are none)."""
+    client.returns["list_assets"] = [
+        {"id": f"asset-{i}", "originalFileName": name}
+        for i, name in enumerate(filenames, 1)
+    ]
+    
+    result = configured.refresh(str(tmp_path))
+    
+    assert result.status == expected_status
+    assert result.downloaded == len(filenames)
+    assert sorted(client.downloads) == [f"asset-{i}" for i in range(1, len(filenames) + 1)]
+    assert sorted(os.listdir(tmp_path)) == filenames
+
+
+def test_refresh_discards_partial_download(configured, client, tmp_path):
+    """A failed download should not leave a file that later counts as existing."""
+    client.download = lambda asset_id, path: False  # immich-lib's failure signal
+    client.returns["list_assets"] = [{"id": "asset-1", "originalFileName": "photo1.jpg"}]
+    
+    result = configured.refresh(str(tmp_path))
+    
+    assert result.status == RefreshStatus.FAILED
+    assert os.listdir(tmp_path) == []
+
+
+def test_refresh_reports_failed_downloads(configured, client, tmp_path):
+    """refresh should count failures from parallel downloads."""
+    def download_asset(asset_id, path):
+        if asset_id == "asset-1":
+            raise IOError("boom")
+        return fake_download(asset_id, path)
+    
+    client.download = download_asset
+    client.returns["list_assets"] = [
+        {"id": "asset-1", "originalFileName": "photo1.jpg"},
+        {"id": "asset-2", "originalFileName": "photo2.jpg"},
+        {"id": "asset-3", "originalFileName": "photo2.jpg"},
+    ]
+    
+    result = configured.refresh(str(tmp_path))
+    
+    assert result.status == RefreshStatus.PARTIAL
+    assert (result.downloaded, result.failed, result.skipped) == (1, 1, 1)
+    assert "photo1.jpg" in result.errors[0]
+
+
+@pytest.mark.parametrize("configured, expected_downloads", [
+    ({"skip_existing": "True"}, ["asset-2"]),
+    ({"skip_existing": "False"}, ["asset-1", "asset-2"]),
+], indirect=["configured"], ids=["skip", "overwrite"])
+def test_refresh_skips_existing(configured, client, tmp_path, expected_downloads):
+    """refresh should skip existing files only when skip_existing is True."""
+    # The provider lists the folder once with scandir, so the file has to really exist
+    (tmp_path / "photo1.jpg").touch()
+    
+    client.returns["list_assets"] = [
+        {"id": "asset-1", "originalFileName": "photo1.jpg"},
+        {"id": "asset-2", "originalFileName": "photo2.jpg"},
+    ]
+    
+    result = configured.refresh(str(tmp_path))
+    
+    assert result.downloaded == len(expected_downloads)
+    assert result.skipped == 2 - len(expected_downloads)
+    assert sorted(client.downloads) == expected_downloads
+
+
+@pytest.mark.parametrize("configured", [{"skip_existing": "False"}], indirect=True)
+def test_refresh_downloads_duplicate_names_once(configured, client, tmp_path):
+    """Assets sharing a file name must not be downloaded to the same path in parallel."""
+    client.returns["list_assets"] = [
+        {"id": "asset-1", "originalFileName": "IMG_0001.JPG"},
+        {"id": "asset-2", "originalFileName": "IMG_0001.JPG"},
+    ]
+    
+    result = configured.refresh(str(tmp_path))
+    
+    assert result.status == RefreshStatus.SUCCESS
+    assert (result.downloaded, result.failed, result.skipped) == (1, 0, 1)
+    assert client.downloads == ["asset-1"]
+    assert os.listdir(tmp_path) == ["IMG_0001.JPG"]
+
+
+@pytest.mark.parametrize("configured", [{"album_name": "Vacation"}], indirect=True)
+def test_refresh_from_album(configured, client, tmp_path):
+    """refresh should download from specific album when configured."""
+    client.returns["find_album"] = {"id": "album-123", "albumName": "Vacation"}
+    client.returns["get_album"] = {
+        "id": "album-123",
+        "assets": [{"id": "asset-1", "originalFileName": "beach.jpg"}]
+    }
+    
+    result = configured.refresh(str(tmp_path))
+    
+    assert ("find_album", "Vacation") in client.calls
+    assert result.downloaded == 1
+
+
+@pytest.mark.parametrize("configured", [{"album_name": "Vacation"}], indirect=True)
+def test_refresh_reuses_album_id(configured, client, tmp_path):
+    """A second refresh should fetch the album by id without looking it up by name."""
+    client.returns["find_album"] = {"id": "album-123", "albumName": "Vacation"}
+    client.returns["get_album"] = {"id": "album-123", "assets": []}
+    
+    configured.refresh(str(tmp_path))
+    configured.refresh(str(tmp_path))
+    
+    assert client.calls == [
+        ("find_album", "Vacation"),
+        ("get_album", "album-123"),
+        ("get_album", "album-123"),
+    ]
+
+
+@pytest.mark.parametrize("configured", [{"album_name": "Vacation"}], indirect=True)
+def test_refresh_recovers_from_deleted_album(configured, client, tmp_path):
+    """If the remembered album id is gone, refresh should look the album up by name again."""
+    client.returns["find_album"] = {"id": "album-123", "albumName": "Vacation"}
+    client.returns["get_album"] = {"id": "album-123", "assets": []}
+    configured.refresh(str(tmp_path))
+    
+    def get_album(album_id):
+        client.calls.append(("get_album", album_id))
+        if album_id == "album-123":
+            raise IOError("404 Not Found")  # immich-lib raise_for_status()
+        return {"id": album_id, "assets": []}
+    
+    client.get_album = get_album
+    client.returns["find_album"] = {"id": "album-456", "albumName": "Vacation"}
+    del client.calls[:]
+    
+    result = configured.refresh(str(tmp_path))
+    
+    assert result.status == RefreshStatus.NO_IMAGES
+    assert client.calls == [
+        ("get_album", "album-123"),
+        ("find_album", "Vacation"),
+        ("get_album", "album-456"),
+    ]
+    assert configured._album_id == "album-456"
+
+
+def test_refresh_invalid_config(provider, tmp_path):
+    """refresh should fail with invalid config."""
+    result = provider.refresh(str(tmp_path))
+    
+    assert result.status == RefreshStatus.FAILED
+    assert "Configuration error" in result.message
 
 
 if __name__ == "__main__":
-    unittest.main()
+    sys.exit(pytest.main([__file__]))
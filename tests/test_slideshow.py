@@ -1,34 +1,42 @@
+import configparser
+import functools
 import os
 import sys
+from pathlib import Path
+
+import pytest
 
 # Add root folder to path to import slideshow
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-def test_config():
-    import configparser
+from database import DEFAULT_IMAGE_EXTENSIONS
+
+# Same extensions the slideshow accepts by default
+IMAGE_EXTENSIONS = frozenset(DEFAULT_IMAGE_EXTENSIONS.split(','))
+
+@functools.lru_cache(maxsize=4)
+def _load_config(path, mtime_ns):
+    # Keyed on mtime so an edited file is parsed again
     config = configparser.ConfigParser()
+    config.read(path)
+    return config
+
+def test_config():
     config_path = os.path.join(os.path.dirname(__file__), '..', 'config.ini')
-    if not os.path.exists(config_path):
-        print("❌ Config not found")
-        return False
-    config.read(config_path)
-    print("✓ Config loaded")
-    return "slideshow" in config
+    try:
+        config = _load_config(config_path, os.stat(config_path).st_mtime_ns)
+    except FileNotFoundError:
+        pytest.fail("config.ini not found")
+    assert "slideshow" in config
 
 def test_images():
-    test_dir = os.path.join(os.path.dirname(__file__), 'test_images')
-    if not os.path.isdir(test_dir):
-        print("❌ test_images not found")
-        return False
-    imgs = [f for f in os.listdir(test_dir) if f.endswith(('.png', '.jpg'))]
-    print(f"✓ Found {len(imgs)} images")
-    return len(imgs) > 0
+    test_dir = Path(__file__).parent / 'test_images'
+    assert test_dir.is_dir(), "test_images not found (run tests/create_test_images.py)"
+    # Count in one pass without building a list of names
+    with os.scandir(test_dir) as entries:
+        count = sum(1 for entry in entries
+                    if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS)
+    assert count > 0
 
 if __name__ == "__main__":
-    results = [test_config(), test_images()]
-    if all(results):
-        print("✓ All tests passed")
-        sys.exit(0)
-    else:
-        print("❌ Some tests failed")
-        sys.exit(1)
+    sys.exit(pytest.main([__file__]))
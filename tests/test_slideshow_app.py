@@ -0,0 +1,209 @@
+"""
+Unit tests for SlideshowApp that run without a display.
+
+The Tk root is a MagicMock; only tk.Label is created for real, which works
+without a display because nothing is ever drawn.
+"""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image, ImageOps
+
+import slideshow
+from database import Database
+from slideshow import SlideshowApp
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        (tmp_path / name).touch()
+    return tmp_path
+
+
+@pytest.fixture
+def app(folder):
+    return SlideshowApp(MagicMock(), str(folder), fullscreen=False, db=None)
+
+
+def played(app):
+    """File names in play order."""
+    return [os.path.basename(app.images[i]) for i in app._order]
+
+
+def current(app):
+    return played(app)[app.current_image_index]
+
+
+def test_load_images_initial_scan(app):
+    assert played(app) == ["a.jpg", "b.jpg", "c.jpg"]
+    assert app.current_image_index == 0
+
+
+def test_load_images_keeps_current_image_and_order(app, folder):
+    app._order = [2, 0, 1]  # Shuffled: c, a, b
+    app.current_image_index = 2  # Showing b
+
+    (folder / "a.jpg").unlink()
+    (folder / "d.jpg").touch()
+    app.load_images()
+
+    # Survivors keep their place, new files are appended, removed ones are dropped
+    assert played(app) == ["c.jpg", "b.jpg", "d.jpg"]
+    assert current(app) == "b.jpg"
+    assert sorted(app._order) == list(range(len(app.images)))
+
+
+def test_load_images_removing_current_image(app, folder):
+    app.current_image_index = 2  # Showing c
+
+    (folder / "c.jpg").unlink()
+    app.load_images()
+
+    assert played(app) == ["a.jpg", "b.jpg"]
+    assert 0 <= app.current_image_index < len(app._order)
+
+
+def test_load_images_prunes_caches_of_removed_files(app, folder):
+    removed = str(folder / "a.jpg")
+    kept = str(folder / "b.jpg")
+    for path in (removed, kept):
+        app._photo_cache[((path, 0, 800, 600, "landscape"), None)] = (MagicMock(), None)
+        app._orient_cache[path] = (0, 1)
+
+    (folder / "a.jpg").unlink()
+    app.load_images()
+
+    assert [key[0][0] for key in app._photo_cache] == [kept]
+    assert list(app._orient_cache) == [kept]
+
+
+def test_load_images_all_removed(app, folder):
+    app.current_image_index = 1
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        (folder / name).unlink()
+
+    app.load_images()
+
+    assert app.images == []
+    assert app._order == []
+    assert app.current_image_index == 0
+
+
+def test_load_images_filters_extensions(app, folder):
+    (folder / "notes.txt").touch()
+    (folder / "E.PNG").touch()
+    (folder / "sub.jpg").mkdir()
+
+    app.load_images()
+
+    assert sorted(played(app)) == ["E.PNG", "a.jpg", "b.jpg", "c.jpg"]
+
+
+def test_load_images_follows_symlinks(app, folder, tmp_path_factory):
+    usb = tmp_path_factory.mktemp("usb")
+    (usb / "linked.jpg").touch()
+    (folder / "linked.jpg").symlink_to(usb / "linked.jpg")
+    (folder / "dangling.jpg").symlink_to(usb / "missing.jpg")
+
+    app.load_images()
+
+    assert "linked.jpg" in played(app)
+    assert "dangling.jpg" not in played(app)
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_auto_reload_rearms_inky_after_failure(folder, tmp_path, monkeypatch, enabled):
+    # No Inky hardware here; detection fails and the worker would retry it
+    monkeypatch.setattr(slideshow, "auto", MagicMock(side_effect=RuntimeError("no board")))
+    db = Database(":memory:", config_locations=[str(tmp_path / "missing.ini")])
+    db.set_setting("enable_inky", str(enabled))
+    app = SlideshowApp(MagicMock(), str(folder), fullscreen=False, db=db)
+    assert app.ink_screen is enabled
+
+    app.ink_screen = False  # What _inky_worker does when an update fails
+    app.auto_reload()
+
+    assert app.ink_screen is enabled
+
+
+@pytest.mark.parametrize("orientation", range(1, 9))
+def test_prepare_frame_matches_exif_transpose(app, tmp_path, orientation):
+    # Every pixel distinct, and lossless PNG, so any wrong flip or rotation shows up
+    img = Image.new("RGB", (6, 3))
+    img.putdata([(i * 10, 255 - i * 10, i) for i in range(18)])
+    exif = Image.Exif()
+    exif[slideshow.EXIF_ORIENTATION] = orientation
+    path = str(tmp_path / f"orient{orientation}.png")
+    img.save(path, exif=exif)
+
+    with Image.open(path) as src:
+        expected = ImageOps.exif_transpose(src)
+    # A window the size of the upright photo, so no resampling happens
+    win_w, win_h = expected.size
+    key = (path, os.stat(path).st_mtime_ns, win_w, win_h, "landscape")
+    img_gui, img_tk = app._prepare_frame(key, None)
+
+    assert img_tk.size == expected.size
+    assert img_tk.convert("RGB").tobytes() == expected.convert("RGB").tobytes()
+
+
+def test_update_display_rerenders_replaced_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(slideshow.ImageTk, "PhotoImage", lambda img: SimpleNamespace(img=img))
+    path = tmp_path / "a.png"
+    Image.new("RGB", (8, 6), "red").save(path)
+    root = MagicMock()
+    root.winfo_width.return_value = 80
+    root.winfo_height.return_value = 60
+    app = SlideshowApp(root, str(tmp_path), fullscreen=False, db=None)
+
+    app.update_display()
+    assert app.photo_image.img.getpixel((0, 0)) == (255, 0, 0)
+
+    # Replaced in place under the same name, with a newer mtime
+    Image.new("RGB", (8, 6), "blue").save(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    app.update_display()
+
+    assert app.photo_image.img.getpixel((0, 0)) == (0, 0, 255)
+
+
+def test_prepare_frame_drafts_for_larger_inky_panel(app, tmp_path, monkeypatch):
+    path = str(tmp_path / "big.jpg")
+    Image.new("RGB", (400, 300), "green").save(path)
+    sources = []
+    resize = Image.Image.resize
+    def spy(img, size, *args, **kwargs):
+        sources.append(img.size)
+        return resize(img, size, *args, **kwargs)
+    monkeypatch.setattr(Image.Image, "resize", spy)
+
+    # The window alone would let libjpeg decode at 1/4 scale (100x75)
+    key = (path, os.stat(path).st_mtime_ns, 80, 48, "landscape")
+    img_gui, img_tk = app._prepare_frame(key, (160, 120))
+
+    assert img_gui.size == (160, 120)
+    src_w, src_h = sources[0]
+    assert src_w >= 160 and src_h >= 120
+
+
+def test_update_display_rerenders_for_inky_panel(tmp_path, monkeypatch):
+    monkeypatch.setattr(slideshow.ImageTk, "PhotoImage", lambda img: SimpleNamespace(img=img))
+    Image.new("RGB", (8, 6), "red").save(tmp_path / "a.png")
+    root = MagicMock()
+    root.winfo_width.return_value = 80
+    root.winfo_height.return_value = 60
+    app = SlideshowApp(root, str(tmp_path), fullscreen=False, db=None)
+    queued = []
+    monkeypatch.setattr(app, "_queue_inky", queued.append)
+
+    app.update_display()  # Cached while the panel is off
+    app.ink_screen = True
+    app._inky_resolution = (160, 120)
+    app.update_display()
+
+    assert [img.size for img in queued] == [(160, 120)]